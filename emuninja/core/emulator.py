@@ -1,8 +1,8 @@
 import asyncio
-import glob
+import copy
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
 
 # Import the actual interfaces and protocols
 from ..interfaces.base import CommunicationInterface
@@ -15,6 +15,21 @@ from ..protocols.scpi_handler import ScpiProtocolHandler
 from ..utils.config import load_config_from_yaml
 from .rules import RuleEngine
 
+# Interface type -> constructor taking the interface config
+INTERFACE_FACTORIES: Dict[str, Callable[[Dict[str, Any]], CommunicationInterface]] = {
+    "serial": SerialInterface,
+    "tcp": TcpServerInterface,
+}
+
+# Protocol type -> factory taking (protocol config, rule engine, interface config)
+PROTOCOL_FACTORIES: Dict[
+    str, Callable[[Dict[str, Any], RuleEngine, Dict[str, Any]], ProtocolHandler]
+] = {
+    "raw": lambda config, rules, _: RawProtocolHandler(config, rules),
+    "scpi": lambda config, rules, _: ScpiProtocolHandler(config, rules),
+    "modbus_tcp": ModbusTcpProtocolHandler,
+}
+
 
 class DeviceInstance:
     """Represents a single running emulated device."""
@@ -35,7 +50,7 @@ class DeviceInstance:
 
     async def start(self):
         """Starts the device emulation task."""
-        self.logger.info(f"Starting device instance: {self.name}")
+        self.logger.info("Starting device instance: %s", self.name)
         try:
             if hasattr(self.protocol, "start"):
                 await self.protocol.start()
@@ -44,12 +59,12 @@ class DeviceInstance:
                     self.interface.start(self.protocol.handle_data)
                 )
         except Exception as e:
-            self.logger.error(f"Failed to start device {self.name}: {e}")
+            self.logger.exception("Failed to start device %s: %s", self.name, e)
             raise
 
     async def stop(self):
         """Stops the device emulation task."""
-        self.logger.info(f"Stopping device instance: {self.name}")
+        self.logger.info("Stopping device instance: %s", self.name)
         if hasattr(self.protocol, "stop"):
             await self.protocol.stop()
         else:
@@ -69,36 +84,78 @@ class EmulatorManager:
         self.devices_dir = devices_dir
         self.devices: Dict[str, DeviceInstance] = {}
         self.logger = logging.getLogger("emuninja.manager")
+        # Config file path -> ((mtime_ns, size), parsed config), reused on
+        # restart; devices get copies, so their state never leaks into it
+        self._config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
 
-    def load_configs(self):
-        """Loads and validates all device configuration files from the devices directory."""
+    async def load_configs(self):
+        """Loads and validates all device configuration files from the devices directory.
+
+        Files are parsed concurrently in worker threads; results keep the file order.
+        Files unchanged since the previous call (same mtime and size) are not reparsed.
+        Each call returns fresh copies, so a restart starts from the files' values.
+        """
         if not os.path.exists(self.devices_dir):
             raise FileNotFoundError(f"Devices directory not found: {self.devices_dir}")
 
+        # Entries carry name and file type, so only .yaml files are stat()ed
+        config_files = []
+        stamps = []
+        with os.scandir(self.devices_dir) as entries:
+            for entry in entries:
+                if (
+                    entry.name.endswith(".yaml")
+                    and not entry.name.startswith(".")
+                    and entry.is_file()
+                ):
+                    st = entry.stat()
+                    config_files.append(entry.path)
+                    stamps.append((st.st_mtime_ns, st.st_size))
+
+        results = await asyncio.gather(
+            *(
+                self._load_config(config_file, stamp)
+                for config_file, stamp in zip(config_files, stamps)
+            ),
+            return_exceptions=True,
+        )
+
         device_configs = []
-        for config_file in glob.glob(os.path.join(self.devices_dir, "*.yaml")):
-            try:
-                device_config = load_config_from_yaml(config_file)
-                device_configs.append(device_config)
-                self.logger.info(f"Loaded device configuration from: {config_file}")
-            except Exception as e:
-                self.logger.error(f"Failed to load config from {config_file}: {e}")
-                raise
+        for config_file, stamp, result in zip(config_files, stamps, results):
+            if isinstance(result, BaseException):
+                self._config_cache.pop(config_file, None)
+                self.logger.error(
+                    "Failed to load config from %s: %s",
+                    config_file,
+                    result,
+                    exc_info=result,
+                )
+                raise result
+            self._config_cache[config_file] = (stamp, result)
+            device_configs.append(copy.deepcopy(result))
+            self.logger.info("Loaded device configuration from: %s", config_file)
 
         return device_configs
 
+    async def _load_config(
+        self, config_file: str, stamp: Tuple[int, int]
+    ) -> Dict[str, Any]:
+        """Returns the cached config for an unchanged file, else parses it in a thread."""
+        cached = self._config_cache.get(config_file)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        return await asyncio.to_thread(load_config_from_yaml, config_file)
+
     def _create_interface(self, config: Dict[str, Any]) -> CommunicationInterface:
         """Creates a communication interface based on config."""
         interface_type = config.get("type")
         if not interface_type:
             raise ValueError("Interface config missing 'type'")
 
-        if interface_type == "serial":
-            return SerialInterface(config)
-        elif interface_type == "tcp":
-            return TcpServerInterface(config)
-        else:
+        factory = INTERFACE_FACTORIES.get(interface_type)
+        if factory is None:
             raise ValueError(f"Unsupported interface type: {interface_type}")
+        return factory(config)
 
     def _create_protocol(
         self, config: Dict[str, Any], interface_config: Dict[str, Any]
@@ -107,24 +164,28 @@ class EmulatorManager:
         protocol_type = config.get("type")
         if not protocol_type:
             raise ValueError("Protocol config missing 'type'")
+        factory = PROTOCOL_FACTORIES.get(protocol_type)
+        if factory is None:
+            raise ValueError(f"Unsupported protocol type: {protocol_type}")
+        if protocol_type == "scpi" and interface_config.get("terminator"):
+            # The interface would strip the terminator the SCPI handler
+            # buffers commands on, so no command would ever be answered
+            raise ValueError(
+                "SCPI devices frame commands on the protocol 'terminator'; "
+                "remove the interface 'terminator'"
+            )
 
         rules_config = config.get("rules", [])
         registers_config = config.get("registers", {})
-        rule_engine = RuleEngine(rules_config, registers_config)
-
-        if protocol_type == "raw":
-            return RawProtocolHandler(config, rule_engine)
-        elif protocol_type == "scpi":
-            return ScpiProtocolHandler(config, rule_engine, interface_config)
-        elif protocol_type == "modbus_tcp":
-            return ModbusTcpProtocolHandler(config, rule_engine, interface_config)
-        else:
-            raise ValueError(f"Unsupported protocol type: {protocol_type}")
+        rule_engine = RuleEngine(
+            rules_config, registers_config, config.get("regex_engine", "re")
+        )
+        return factory(config, rule_engine, interface_config)
 
     def _create_device_instance(self, device_config: Dict[str, Any]) -> DeviceInstance:
         """Creates a single DeviceInstance from its configuration."""
         name = device_config.get("name", "UnnamedDevice")
-        self.logger.info(f"Creating device: {name}")
+        self.logger.info("Creating device: %s", name)
 
         try:
             interface_config = device_config.get("interface", {})
@@ -134,14 +195,15 @@ class EmulatorManager:
             )
             return DeviceInstance(name, device_config, interface, protocol)
         except Exception as e:
-            self.logger.error(f"Error creating device {name}: {e}")
+            self.logger.exception("Error creating device %s: %s", name, e)
             raise
 
     async def start_all(self):
         """Loads configs and starts all configured and enabled device instances."""
-        device_configs = self.load_configs()
+        device_configs = await self.load_configs()
         self.devices = {}
-        start_tasks: List[asyncio.Task[None]] = []
+        # Bare coroutines: gather wraps each in exactly one task
+        start_tasks: List[Coroutine[Any, Any, None]] = []
         loaded_device_count = 0
 
         for device_conf in device_configs:
@@ -151,21 +213,23 @@ class EmulatorManager:
 
             if not isinstance(is_enabled, bool):
                 self.logger.warning(
-                    f"Device '{device_name}': 'enabled' flag is not a boolean ({is_enabled}). Assuming true."
+                    "Device '%s': 'enabled' flag is not a boolean (%s). Assuming true.",
+                    device_name,
+                    is_enabled,
                 )
                 is_enabled = True
 
             if not is_enabled:
-                self.logger.info(f"Skipping disabled device: {device_name}")
+                self.logger.info("Skipping disabled device: %s", device_name)
                 continue
 
             try:
                 instance = self._create_device_instance(device_conf)
                 self.devices[instance.name] = instance
-                start_tasks.append(asyncio.create_task(instance.start()))
+                start_tasks.append(instance.start())
             except Exception as e:
-                self.logger.error(
-                    f"Error creating or starting enabled device '{device_name}': {e}"
+                self.logger.exception(
+                    "Error creating or starting enabled device '%s': %s", device_name, e
                 )
 
         if not device_configs:
@@ -177,7 +241,7 @@ class EmulatorManager:
         elif start_tasks:
             await asyncio.gather(*start_tasks, return_exceptions=True)
             self.logger.info(
-                f"Successfully attempted to start {len(start_tasks)} enabled devices."
+                "Successfully attempted to start %d enabled devices.", len(start_tasks)
             )
 
     async def stop_all(self):
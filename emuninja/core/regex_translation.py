@@ -0,0 +1,234 @@
+"""
+Translation of Python regex rules for the optional Hyperscan and RE2 engines.
+
+Both engines accept most of Python's regex syntax, but read some of it
+differently: Python takes 'a{,3}' as a quantifier where they see literal
+text, their '\\w', '\\d' and '\\s' cover other characters, and RE2's '$' does
+not match before a trailing newline. Rule patterns are therefore never
+passed through as written. They are parsed with Python's own parser and
+written back out from constructs every engine reads the same way: each
+single-character matcher becomes an explicit list of code point ranges,
+computed by letting Python's re match it against every character, and each
+anchor its unambiguous form. Patterns using anything that cannot be
+expressed exactly (lookarounds, backreferences, ...) are not translated and
+stay on Python's re.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+_C = sre_constants
+
+# Python's class shorthands, as written inside a character set
+_CATEGORIES = {
+    _C.CATEGORY_DIGIT: r"\d",
+    _C.CATEGORY_NOT_DIGIT: r"\D",
+    _C.CATEGORY_SPACE: r"\s",
+    _C.CATEGORY_NOT_SPACE: r"\S",
+    _C.CATEGORY_WORD: r"\w",
+    _C.CATEGORY_NOT_WORD: r"\W",
+}
+
+# Nodes that match exactly one character
+_SINGLE_CHARACTER = (_C.LITERAL, _C.NOT_LITERAL, _C.ANY, _C.IN)
+
+# Flags that change which characters a single-character node matches
+_CHARACTER_FLAGS = ((re.IGNORECASE, "i"), (re.DOTALL, "s"), (re.ASCII, "a"))
+
+# Code points that cannot appear in (UTF-8) subjects
+_SURROGATES = range(0xD800, 0xE000)
+
+
+class _Untranslatable(Exception):
+    """Raised for a construct that has no exact equivalent."""
+
+
+@lru_cache(maxsize=1024)
+def translate_regex(pattern: str, ascii_only: bool) -> Optional[str]:
+    """
+    Rewrites a Python regex so Hyperscan and RE2 match exactly what re does.
+
+    The result matches at the same positions as `re.match` with the pattern,
+    though it may consume a trailing newline where the pattern ends in '$';
+    its groups are all non-capturing.
+
+    Args:
+        pattern: The Python regular expression (str, with any flags inline).
+        ascii_only: Whether the expression will only be run against ASCII
+                    subjects, as for the Hyperscan prefilter. Character
+                    classes then list ASCII characters only.
+
+    Returns:
+        The equivalent expression, or None if the pattern cannot be translated.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+        return _translate(parsed, parsed.state.flags, ascii_only, tail=True)
+    except (re.error, _Untranslatable):
+        return None
+    except Exception as e:
+        # The parser is private to re; if its node shapes change in a future
+        # Python, patterns stay on re instead of breaking the rule engine
+        logger.warning("Cannot translate regex %r: %r", pattern, e)
+        return None
+
+
+def _translate(items: Iterable[Any], flags: int, ascii_only: bool, tail: bool) -> str:
+    """
+    Translates a parsed sequence.
+
+    Args:
+        items: The (opcode, argument) nodes of the sequence.
+        flags: The regex flags in effect.
+        ascii_only: See `translate_regex`.
+        tail: Whether nothing follows the sequence in the pattern.
+    """
+    items = list(items)
+    last = len(items) - 1
+    return "".join(
+        _translate_node(op, av, flags, ascii_only, tail and position == last)
+        for position, (op, av) in enumerate(items)
+    )
+
+
+def _translate_node(op: Any, av: Any, flags: int, ascii_only: bool, tail: bool) -> str:
+    """Translates one parsed node; raises _Untranslatable if it cannot."""
+    if op in _SINGLE_CHARACTER:
+        letters = "".join(letter for flag, letter in _CHARACTER_FLAGS if flags & flag)
+        translated = _character_class(_python_source(op, av), letters, ascii_only)
+        if translated is None:
+            raise _Untranslatable(op)
+        return translated
+    if op is _C.SUBPATTERN:
+        _, add_flags, del_flags, items = av
+        inner = _translate(items, (flags | add_flags) & ~del_flags, ascii_only, tail)
+        return f"(?:{inner})"
+    if op is _C.BRANCH:
+        branches = (_translate(items, flags, ascii_only, tail) for items in av[1])
+        return f"(?:{'|'.join(branches)})"
+    if op is _C.MAX_REPEAT or op is _C.MIN_REPEAT:
+        low, high, items = av
+        inner = _translate(items, flags, ascii_only, tail=False)
+        lazy = "?" if op is _C.MIN_REPEAT else ""
+        return f"(?:{inner}){_quantifier(low, high)}{lazy}"
+    if op is _C.AT:
+        return _anchor(av, flags, ascii_only, tail)
+    raise _Untranslatable(op)
+
+
+def _anchor(code: Any, flags: int, ascii_only: bool, tail: bool) -> str:
+    """Translates an anchor; raises _Untranslatable if it cannot."""
+    if code is _C.AT_BEGINNING_STRING or (
+        code is _C.AT_BEGINNING and not flags & re.MULTILINE
+    ):
+        return r"\A"
+    if code is _C.AT_END_STRING:
+        return r"\z"
+    if code is _C.AT_END and tail:
+        # Python's '$' also matches before a final newline ('(?m)$' before
+        # any); nothing follows in the pattern, so consuming it is harmless
+        return r"(?:\n|\z)" if flags & re.MULTILINE else r"(?:\n?\z)"
+    if code in (_C.AT_BOUNDARY, _C.AT_NON_BOUNDARY) and (
+        ascii_only or flags & re.ASCII
+    ):
+        # Word boundaries agree wherever both sides see ASCII word characters
+        return r"\b" if code is _C.AT_BOUNDARY else r"\B"
+    raise _Untranslatable(code)
+
+
+def _quantifier(low: int, high: int) -> str:
+    """Writes a repeat count in the syntax common to all engines."""
+    if high == _C.MAXREPEAT:
+        return {0: "*", 1: "+"}.get(low, f"{{{low},}}")
+    if low == high:
+        return f"{{{low}}}"
+    if (low, high) == (0, 1):
+        return "?"
+    return f"{{{low},{high}}}"
+
+
+def _python_source(op: Any, av: Any) -> str:
+    """Writes a single-character node back as Python regex source."""
+    if op is _C.LITERAL:
+        return _python_char(av)
+    if op is _C.NOT_LITERAL:
+        return f"[^{_python_char(av)}]"
+    if op is _C.ANY:
+        return "."
+    members: List[str] = []
+    for member_op, member_av in av:
+        if member_op is _C.NEGATE:
+            members.append("^")
+        elif member_op is _C.LITERAL:
+            members.append(_python_char(member_av))
+        elif member_op is _C.RANGE:
+            low, high = member_av
+            members.append(f"{_python_char(low)}-{_python_char(high)}")
+        elif member_op is _C.CATEGORY and member_av in _CATEGORIES:
+            members.append(_CATEGORIES[member_av])
+        else:
+            raise _Untranslatable(member_op)
+    return f"[{''.join(members)}]"
+
+
+def _python_char(code: int) -> str:
+    return f"\\U{code:08x}"
+
+
+@lru_cache(maxsize=None)
+def _universe(ascii_only: bool) -> str:
+    """Every character a subject can contain, in code point order."""
+    if ascii_only:
+        return "".join(map(chr, range(0x80)))
+    return "".join(map(chr, range(_SURROGATES.start))) + "".join(
+        map(chr, range(_SURROGATES.stop, 0x110000))
+    )
+
+
+@lru_cache(maxsize=4096)
+def _character_class(source: str, letters: str, ascii_only: bool) -> Optional[str]:
+    """
+    Lists the characters a Python single-character matcher accepts.
+
+    Args:
+        source: The matcher as Python regex source.
+        letters: Its inline flag letters (e.g. 'i').
+        ascii_only: Whether only ASCII characters need to be listed.
+
+    Returns:
+        The characters as an explicit class of '\\x{...}' ranges, or None if
+        it accepts none of them.
+    """
+    flags = f"(?{letters})" if letters else ""
+    runs = re.compile(f"{flags}(?:{source})+")
+    ranges: List[str] = []
+    for match in runs.finditer(_universe(ascii_only)):
+        # Universe positions past the surrogate gap are shifted down
+        low, high = match.start(), match.end() - 1
+        if not ascii_only and high >= _SURROGATES.start:
+            if low < _SURROGATES.start:
+                ranges.append(_range(low, _SURROGATES.start - 1))
+                low = _SURROGATES.start
+            low, high = low + len(_SURROGATES), high + len(_SURROGATES)
+        ranges.append(_range(low, high))
+    if not ranges:
+        return None
+    if len(ranges) == 1 and "-" not in ranges[0]:
+        return ranges[0]
+    return f"[{''.join(ranges)}]"
+
+
+def _range(low: int, high: int) -> str:
+    if low == high:
+        return f"\\x{{{low:x}}}"
+    return f"\\x{{{low:x}}}-\\x{{{high:x}}}"
@@ -1,14 +1,297 @@
+import logging
 import re
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 
+from .regex_translation import translate_regex
 
-@dataclass
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None  # Optional: regex rules fall back to Python's re
+
+try:
+    import re2
+except ImportError:
+    re2 = None  # Optional: only used by devices with 'regex_engine: re2'
+
+logger = logging.getLogger(__name__)
+
+# Patterns using numbered backreferences or conditionals depend on their own
+# group numbering, which shifts once they are embedded in the combined regex.
+# (Named groups are checked separately: a name may only be used once in it.)
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+# Inline flag groups at the start of a pattern, which apply to all of it
+# and are only allowed there ('(?i)VOLT?')
+_GLOBAL_FLAGS = re.compile(r"(?:\(\?[aiLmsux]+\))+")
+
+# Regex rule 'flags' -> inline flag letter. Only flags that can be scoped to a
+# single pattern are accepted, since regex rules share one combined pattern.
+_REGEX_FLAGS = {
+    "IGNORECASE": "i",
+    "I": "i",
+    "MULTILINE": "m",
+    "M": "m",
+    "DOTALL": "s",
+    "S": "s",
+}
+
+
+def _scope_flags(pattern: str, flags: Any) -> str:
+    """
+    Applies a rule's regex flags to its pattern as a scoped inline group.
+
+    Args:
+        pattern: The rule's regular expression.
+        flags: A flag name or list of names (e.g. 'IGNORECASE'), or None.
+
+    Returns:
+        The pattern wrapped as '(?flags:pattern)', or unchanged without flags.
+        Global flags leading the pattern ('(?s)...') are merged into the group.
+
+    Raises:
+        ValueError: If a flag name is not supported.
+    """
+    if not flags:
+        return pattern
+    names = [flags] if isinstance(flags, str) else flags
+    letters = set()
+    for name in names:
+        letter = _REGEX_FLAGS.get(str(name).upper())
+        if letter is None:
+            raise ValueError(f"unsupported regex flag {name!r}")
+        letters.add(letter)
+    return _scope_global_flags(pattern, "".join(letters))
+
+
+def _scope_global_flags(pattern: str, extra: str = "") -> str:
+    """
+    Rewrites a pattern's leading global flags as a scoped inline group.
+
+    '(?i)VOLT?' becomes '(?i:VOLT?)', which matches the same but, unlike
+    global flags, may be embedded in a larger pattern.
+
+    Args:
+        pattern: A regular expression.
+        extra: Flag letters to add to the group.
+
+    Returns:
+        The rewritten pattern, or the pattern itself if it has no flags.
+    """
+    leading = _GLOBAL_FLAGS.match(pattern)
+    if leading is None and not extra:
+        return pattern
+    letters = set(extra)
+    rest = pattern
+    if leading is not None:
+        letters.update(leading.group().replace("(?", "").replace(")", ""))
+        rest = pattern[leading.end() :]
+    if "x" in letters:
+        rest += "\n"  # Ends a trailing verbose comment before the ')'
+    return f"(?{''.join(sorted(letters))}:{rest})"
+
+
+def _alternate_key(value: Any) -> Any:
+    """
+    Returns the UTF-8 bytes form of a str value or the str form of a bytes
+    value, or None when there is no such form.
+    """
+    try:
+        if isinstance(value, str):
+            return value.encode("utf-8")
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+    except UnicodeError:
+        pass
+    return None
+
+
+def _first_prefix_rule(trie: Dict[Any, Any], request: Any) -> Optional[int]:
+    """
+    Walks a request down a prefix trie.
+
+    Returns:
+        The lowest rule index among the prefixes the request starts with,
+        or None if it starts with none of them.
+    """
+    node = trie
+    first = node.get(None)
+    for element in request:
+        node = node.get(element)
+        if node is None:
+            break
+        index = node.get(None)
+        if index is not None and (first is None or index < first):
+            first = index
+    return first
+
+
+# ASCII characters that str patterns (but not bytes patterns or Hyperscan)
+# treat as whitespace
+_INFO_SEPARATORS = re.compile("[\x1c-\x1f]")
+_INFO_SEPARATORS_BYTES = re.compile(b"[\x1c-\x1f]")
+
+# Placeholder for unconfigured registers in read_registers
+_MISSING = object()
+
+# Distinct requests whose rule lookup is memoized per RuleEngine
+_LOOKUP_CACHE_SIZE = 2048
+
+# RE2 reports rejected patterns through the exception; keep stderr quiet
+_RE2_OPTIONS: Any = None
+if re2 is not None:
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False
+
+
+_REGEX_ERRORS: Tuple[type, ...] = (re.error,) + ((re2.error,) if re2 else ())
+
+
+def _re2_supports(pattern: str) -> bool:
+    """Returns whether RE2 can compile the pattern (no lookarounds etc.)."""
+    try:
+        re2.compile(pattern, _RE2_OPTIONS)
+    except re2.error:
+        return False
+    return True
+
+
+# Flags for every Hyperscan pattern: report each rule once, accept patterns
+# that match the empty string, and treat input and classes as Unicode.
+_HYPERSCAN_FLAGS = (
+    (
+        hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_ALLOWEMPTY
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+    )
+    if hyperscan is not None
+    else 0
+)
+
+
+@lru_cache(maxsize=1024)
+def _hyperscan_supports(expression: bytes) -> bool:
+    """Returns whether Hyperscan can compile the expression."""
+    try:
+        hyperscan.Database().compile(expressions=[expression], flags=_HYPERSCAN_FLAGS)
+    except hyperscan.error:
+        return False
+    return True
+
+
+@lru_cache(maxsize=64)
+def _hyperscan_database(expressions: Tuple[bytes, ...], ids: Tuple[int, ...]) -> Any:
+    """
+    Compiles a Hyperscan database, reusing it for identical rule sets.
+
+    Devices restarted with unchanged rules skip the (comparatively slow)
+    database compilation.
+    """
+    database = hyperscan.Database()
+    database.compile(
+        expressions=list(expressions), ids=list(ids), flags=_HYPERSCAN_FLAGS
+    )
+    return database
+
+
+def _collect_hyperscan_match(
+    rule_index: int, start: int, end: int, flags: int, candidates: List[int]
+) -> None:
+    """Hyperscan match callback: records the rule whose pattern matched."""
+    candidates.append(rule_index)
+
+
+@dataclass(slots=True, frozen=True)
 class RuleMatch:
-    """Represents a matched rule."""
+    """
+    Represents a matched rule.
+
+    One instance is built per rule at load and returned for every request the
+    rule matches, so it is frozen; only the encoding cache is filled in later.
+    """
 
     response: Any
     delay: float
+    _encoded: Dict[str, bytes] = field(default_factory=dict, repr=False, compare=False)
+
+    def as_bytes(self, encoding: str) -> Optional[bytes]:
+        """
+        Returns the response encoded as bytes, caching the result per encoding.
+
+        Args:
+            encoding: The text encoding used for non-bytes responses.
+
+        Returns:
+            The response bytes, or None if the rule has no response value.
+
+        Raises:
+            UnicodeEncodeError: If the response cannot be encoded.
+        """
+        if isinstance(self.response, bytes):
+            return self.response
+        if self.response is None:
+            return None
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            encoded = str(self.response).encode(encoding)
+            self._encoded[encoding] = encoded
+        return encoded
+
+
+@dataclass(slots=True)
+class CompiledRule:
+    """A configured rule, parsed once when the RuleEngine is built."""
+
+    match_type: Optional[str]
+    value: Any
+    match: RuleMatch
+    regex: Optional[re.Pattern[str]] = None
+    priority: int = 0
+
+    @classmethod
+    def from_dict(cls, rule: Dict[str, Any]) -> "CompiledRule":
+        """
+        Parses a rule dictionary from the device configuration.
+
+        Args:
+            rule: A request-response rule as found under 'rules' in the config.
+
+        Returns:
+            The compiled rule. Regex 'flags' are compiled into the pattern.
+            Invalid regexes or flags leave `regex` unset so the rule never
+            matches; an invalid delay or priority falls back to 0.
+        """
+        receive_rule = rule.get("receive") or {}
+        match_type = receive_rule.get("type")
+        value = receive_rule.get("value")
+
+        try:
+            delay = float(rule.get("delay", 0.0))
+        except (TypeError, ValueError) as e:
+            logger.warning("Invalid delay in rule %s: %s. Using 0.", rule, e)
+            delay = 0.0
+
+        try:
+            priority = int(rule.get("priority", 0))
+        except (TypeError, ValueError) as e:
+            logger.warning("Invalid priority in rule %s: %s. Using 0.", rule, e)
+            priority = 0
+
+        regex = None
+        if match_type == "regex":
+            try:
+                regex = re.compile(_scope_flags(str(value), receive_rule.get("flags")))
+            except (re.error, TypeError, ValueError) as e:
+                logger.warning("Invalid regex '%s': %s", value, e)
+
+        match = RuleMatch(
+            response=(rule.get("respond") or {}).get("value"), delay=delay
+        )
+        return cls(match_type, value, match, regex, priority)
 
 
 class RuleEngine:
@@ -18,30 +301,303 @@ class RuleEngine:
         self,
         rules_config: List[Dict[str, Any]],
         registers_config: Optional[Dict[str, Dict[int, Any]]] = None,
+        regex_engine: str = "re",
     ):
         """
         Initializes the RuleEngine.
 
+        Exact rules are indexed in a dict, under both their str and UTF-8 bytes
+        forms, prefix rules in a character/byte trie, and all regex rules are
+        merged into a single alternation, so a lookup costs one hash probe, one
+        walk over the request and at most one regex match instead of one
+        comparison per rule. When several rules match, the one with the highest
+        optional 'priority' wins, and among equal priorities (the default is 0)
+        the one declared first.
+
         Args:
             rules_config: A list of dictionaries, each defining a request-response rule.
                           Example rule: {'receive': {'type': 'exact', 'value': '*IDN?'},
                                        'respond': {'type': 'exact', 'value': 'Device XYZ'}}
             registers_config: Optional configuration for register-based protocols like Modbus.
                               Example: {'holding': {40001: 123}, 'input': {30001: 1}}
+            regex_engine: 're' (default) or 're2'. With 're2' the combined regex
+                          runs on RE2, whose matching time is linear in the request
+                          length. Patterns are translated so RE2 matches exactly
+                          what re would; rules that cannot be translated or that
+                          RE2 cannot express (backreferences, lookarounds, '$'
+                          before more pattern, Unicode '\\b') still use re.
         """
         self.registers = registers_config if registers_config else {}
-        self._compiled_rules: List[Dict[str, Any]] = []
+        # Stable sort: ties keep their declaration order
+        self._compiled_rules: List[CompiledRule] = sorted(
+            (CompiledRule.from_dict(rule) for rule in rules_config),
+            key=lambda rule: -rule.priority,
+        )
+        # Request value -> index of the first exact rule declaring it
+        self._exact_index: Dict[Any, int] = {}
+        # Request type -> prefix trie (nested dicts keyed by character/byte;
+        # the None key holds the index of the first rule ending at that node)
+        self._prefix_tries: Dict[type, Dict[Any, Any]] = {str: {}, bytes: {}}
+        # Request type -> first character/byte -> the prefixes starting with
+        # it (plus any empty prefix), for a one-call miss check
+        self._prefix_buckets: Dict[type, Dict[Any, Tuple[Any, ...]]] = {}
+        # Regex rules checked one by one (combined compile failed or unsafe)
+        self._regex_indices: List[int] = []
+        self._combined_regex: Optional[Any] = None  # re or re2 pattern
+        # Combined regex group number -> rule index (None for inner groups)
+        self._combined_table: List[Optional[int]] = []
+        self._hyperscan_db: Optional[Any] = None
+        self._hyperscan_ids: List[int] = []
 
-        for rule in rules_config:
-            compiled_rule = rule.copy()
-            if rule.get("receive", {}).get("type") == "regex":
+        mergeable: List[int] = []
+        # Group names used by the mergeable rules so far
+        group_names: Set[str] = set()
+        for index, rule in enumerate(self._compiled_rules):
+            if rule.match_type == "exact":
+                if isinstance(rule.value, str):
+                    # Interned keys are shared with identical strings elsewhere
+                    # (e.g. the YAML config), and compare by identity first
+                    rule.value = sys.intern(rule.value)
                 try:
-                    pattern_str = str(rule["receive"]["value"])
-                    compiled_rule["_compiled_regex"] = re.compile(pattern_str)
-                except (re.error, TypeError) as e:
-                    print(f"Warning: Invalid regex '{rule['receive']['value']}': {e}")
-                    compiled_rule["_compiled_regex"] = None
-            self._compiled_rules.append(compiled_rule)
+                    self._exact_index.setdefault(rule.value, index)
+                except TypeError:
+                    logger.warning("Unhashable exact value %r", rule.value)
+                    continue
+                # Also index the other form, so str rules match bytes requests
+                # (e.g. SCPI commands) and bytes rules match str requests
+                alternate = _alternate_key(rule.value)
+                if alternate is not None:
+                    self._exact_index.setdefault(alternate, index)
+            elif rule.match_type == "prefix":
+                self._add_prefix(rule.value, index)
+            elif rule.regex is not None:
+                names = rule.regex.groupindex.keys()
+                if _GROUP_REFERENCE.search(rule.regex.pattern) or names & group_names:
+                    self._regex_indices.append(index)
+                else:
+                    group_names.update(names)
+                    mergeable.append(index)
+
+        # Rules are fixed once built, so lookups (misses included) can be
+        # memoized per request; repeated commands skip all matching work.
+        # Rule sets with only exact rules are specialized to the bare dict
+        # lookup, which is cheaper than the cache in front of it.
+        self._cached_rule_index: Callable[[Any], Optional[int]]
+        if mergeable or self._regex_indices or self._prefix_buckets:
+            self._cached_rule_index = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(
+                self._find_rule_index
+            )
+        else:
+            self._cached_rule_index = self._exact_index.get
+
+        if regex_engine == "re2" and re2 is None:
+            logger.warning(
+                "regex_engine 're2' requested but google-re2 is not installed, "
+                "using re"
+            )
+            regex_engine = "re"
+        elif regex_engine not in ("re", "re2"):
+            logger.warning("Unknown regex_engine %r, using re", regex_engine)
+            regex_engine = "re"
+
+        if mergeable and regex_engine == "re2":
+            self._compile_combined_re2(mergeable)
+        else:
+            if mergeable and hyperscan is not None:
+                mergeable = self._compile_hyperscan(mergeable)
+            if mergeable:
+                self._compile_combined_regex(mergeable)
+
+        # Per-rule patterns by rule index, as used for str subjects
+        self._str_regexes: List[Optional[re.Pattern[str]]] = [
+            rule.regex for rule in self._compiled_rules
+        ]
+        # str patterns treat 0x1c-0x1f as whitespace, bytes patterns and
+        # Hyperscan do not: requests containing those bytes take the slow path
+        self._check_separators = any(
+            "\\s" in rule.regex.pattern or "\\S" in rule.regex.pattern
+            for rule in self._compiled_rules
+            if rule.regex is not None
+        )
+        # Bytes twins of the patterns above, set when all of them are ASCII
+        self._bytes_regexes: Optional[Dict[int, re.Pattern[bytes]]] = None
+        self._combined_regex_bytes: Optional[re.Pattern[bytes]] = None
+        if regex_engine == "re":
+            self._compile_bytes_regexes()
+
+    def _compile_bytes_regexes(self) -> None:
+        """
+        Compiles bytes versions of the regex rules when every pattern is ASCII.
+
+        For an ASCII request, an ASCII pattern matches the raw bytes exactly as
+        it matches the decoded text (see `_check_separators` for the one
+        exception), so ASCII bytes requests can skip the decode.
+        """
+        indices = self._regex_indices + self._hyperscan_ids
+        patterns = [self._compiled_rules[index].regex.pattern for index in indices]
+        if self._combined_regex is not None:
+            patterns.append(self._combined_regex.pattern)
+        if not patterns or not all(pattern.isascii() for pattern in patterns):
+            return
+        try:
+            bytes_regexes = {
+                index: re.compile(pattern.encode())
+                for index, pattern in zip(indices, patterns)
+            }
+            if self._combined_regex is not None:
+                self._combined_regex_bytes = re.compile(patterns[-1].encode())
+        except re.error:
+            return  # str-only syntax (e.g. \u escapes); keep decoding
+        self._bytes_regexes = bytes_regexes
+
+    def _add_prefix(self, prefix: Any, index: int) -> None:
+        """Adds a prefix rule to the trie for its type and, if possible, the other."""
+        for key in (prefix, _alternate_key(prefix)):
+            if isinstance(key, (str, bytes)):
+                node = self._prefix_tries[type(key)]
+                for element in key:
+                    node = node.setdefault(element, {})
+                node.setdefault(None, index)
+
+                buckets = self._prefix_buckets.setdefault(type(key), {})
+                if key:
+                    # New buckets start with the empty prefixes, if any
+                    bucket = buckets.get(key[:1], buckets.get(key[:0], ()))
+                    buckets[key[:1]] = bucket + (key,)
+                else:
+                    # The empty prefix matches everything: add it everywhere
+                    for first in buckets:
+                        buckets[first] += (key,)
+                    buckets.setdefault(key, (key,))
+
+    def _compile_hyperscan(self, indices: List[int]) -> List[int]:
+        """
+        Compiles regex rules into a single Hyperscan database.
+
+        Patterns are not compiled as written, since Hyperscan reads some
+        Python syntax differently (e.g. 'a{,3}'): each is translated for ASCII
+        subjects, the only ones scanned, into an expression Hyperscan matches
+        exactly like re does (see `translate_regex`). It is anchored to the
+        start of the request, mirroring `re.match`, and tagged with its rule
+        index. Candidates are still confirmed with Python's re.
+
+        Args:
+            indices: Indices of the regex rules to compile.
+
+        Returns:
+            The indices that could not be translated or compiled (e.g.
+            lookarounds), which are left to the Python regex path.
+        """
+        supported: List[int] = []
+        expressions: List[bytes] = []
+        unsupported: List[int] = []
+        for index in indices:
+            translated = translate_regex(
+                self._compiled_rules[index].regex.pattern, ascii_only=True
+            )
+            if translated is None:
+                unsupported.append(index)
+                continue
+            expression = f"^(?:{translated})".encode()
+            if _hyperscan_supports(expression):
+                supported.append(index)
+                expressions.append(expression)
+            else:
+                unsupported.append(index)
+        if supported:
+            self._hyperscan_ids = supported
+            self._hyperscan_db = _hyperscan_database(
+                tuple(expressions), tuple(supported)
+            )
+        return unsupported
+
+    def _compile_combined_re2(self, indices: List[int]) -> None:
+        """
+        Merges the regex rules RE2 supports into one RE2 alternation.
+
+        RE2 reads some Python syntax differently ('$' before a trailing
+        newline, Unicode '\\w'/'\\d', 'a{,3}'), so each pattern is translated
+        into an expression RE2 matches exactly like re does (see
+        `translate_regex`); patterns that cannot be translated, or that RE2
+        cannot compile, are left to re.
+        """
+        supported: List[int] = []
+        translated: Dict[int, str] = {}
+        for index in indices:
+            pattern = self._compiled_rules[index].regex.pattern
+            expression = translate_regex(pattern, ascii_only=False)
+            if expression is not None and _re2_supports(expression):
+                supported.append(index)
+                translated[index] = expression
+            else:
+                logger.warning("RE2 cannot match regex '%s' like re, using re", pattern)
+                self._regex_indices.append(index)
+        self._regex_indices.sort()
+        if supported:
+            self._compile_combined_regex(
+                supported,
+                lambda pattern: re2.compile(pattern, _RE2_OPTIONS),
+                translated,
+            )
+
+    def _compile_combined_regex(
+        self,
+        indices: List[int],
+        compiler: Callable[[str], Any] = re.compile,
+        patterns: Optional[Dict[int, str]] = None,
+    ) -> None:
+        """
+        Merges regex rules into one alternation, one named group per rule.
+
+        The rule group that matched is the match's `lastindex` (it closes
+        after any group nested in it), so the winning rule is a list lookup.
+        Leading global flags ('(?i)...') are scoped to their rule's group.
+
+        Args:
+            indices: Indices of the regex rules to merge.
+            compiler: Compiles the combined pattern.
+            patterns: Rule index -> pattern to use instead of the rule's own.
+        """
+        alternatives = []
+        for index in indices:
+            if patterns is not None:
+                pattern = patterns[index]
+            else:
+                pattern = self._compiled_rules[index].regex.pattern
+            alternatives.append(f"(?P<_r{index}>{_scope_global_flags(pattern)})")
+        try:
+            combined = compiler("|".join(alternatives))
+        except _REGEX_ERRORS as e:
+            logger.warning(
+                "Could not combine regex rules, matching individually: %s", e
+            )
+            self._regex_indices = sorted(self._regex_indices + indices)
+            return
+        self._combined_regex = combined
+        self._combined_table = [None] * (combined.groups + 1)
+        for index in indices:
+            self._combined_table[combined.groupindex[f"_r{index}"]] = index
+
+    def encode_responses(self, encoding: str) -> None:
+        """
+        Pre-encodes every rule's response so matches return cached bytes.
+
+        Protocol handlers call this once with their encoding. Responses that
+        cannot be encoded are reported here, and again when matched.
+
+        Args:
+            encoding: The text encoding used for non-bytes responses.
+        """
+        for rule in self._compiled_rules:
+            try:
+                rule.match.as_bytes(encoding)
+            except UnicodeError as e:
+                logger.warning(
+                    "Cannot encode response %r as %s: %s",
+                    rule.match.response,
+                    encoding,
+                    e,
+                )
 
     def find_response(self, parsed_request: Any) -> Optional[RuleMatch]:
         """
@@ -54,64 +610,135 @@ class RuleEngine:
         Returns:
             A RuleMatch object containing the response value and delay if found, else None.
         """
-        for rule in self._compiled_rules:
-            receive_rule = rule.get("receive", {})
-            if not receive_rule:
-                continue
+        # Malformed rules are reported and disabled when the engine is built,
+        # so matching itself has nothing to recover from
+        try:
+            best = self._cached_rule_index(parsed_request)
+        except TypeError:
+            # Unhashable request (protocol-specific object): no caching
+            best = self._find_rule_index(parsed_request)
 
-            match_type = receive_rule.get("type")
-            request_value = receive_rule.get("value")
-            response_rule = rule.get("respond", {})
-            response_value = response_rule.get("value")
-            delay = float(rule.get("delay", 0.0))
+        if best is None:
+            return None
+        return self._compiled_rules[best].match
 
-            match_found = False
-            try:
-                if match_type == "exact":
-                    if request_value == parsed_request:
-                        match_found = True
-
-                elif match_type == "prefix":
-                    if isinstance(parsed_request, (str, bytes)) and isinstance(
-                        request_value, (str, bytes)
-                    ):
-                        if isinstance(parsed_request, str) and isinstance(
-                            request_value, str
-                        ):
-                            if parsed_request.startswith(request_value):
-                                match_found = True
-                        elif isinstance(parsed_request, bytes) and isinstance(
-                            request_value, bytes
-                        ):
-                            if parsed_request.startswith(request_value):
-                                match_found = True
-
-                elif match_type == "regex":
-                    compiled_regex = rule.get("_compiled_regex")
-                    if compiled_regex:
-                        request_str = None
-                        if isinstance(parsed_request, bytes):
-                            try:
-                                request_str = parsed_request.decode(
-                                    "utf-8", errors="ignore"
-                                )
-                            except UnicodeError:
-                                pass
-                        elif isinstance(parsed_request, str):
-                            request_str = parsed_request
-
-                        if request_str is not None and compiled_regex.match(
-                            request_str
-                        ):
-                            match_found = True
-
-                if match_found:
-                    return RuleMatch(response=response_value, delay=delay)
-
-            except Exception as e:
-                print(f"Error evaluating rule {rule}: {e}")
-
-        return None
+    def _find_rule_index(self, parsed_request: Any) -> Optional[int]:
+        """Returns the index of the first declared rule matching the request."""
+        try:
+            best = self._exact_index.get(parsed_request)
+        except TypeError:
+            best = None
+
+        # startswith() checks the prefixes sharing the request's first
+        # character in a single C call, so misses (the common case) never
+        # walk the trie; hits walk it to find the winner
+        buckets = self._prefix_buckets.get(type(parsed_request))
+        if buckets:
+            prefixes = buckets.get(parsed_request[:1]) or buckets.get(
+                parsed_request[:0], ()
+            )
+        else:
+            prefixes = ()
+        if prefixes and parsed_request.startswith(prefixes):
+            index = _first_prefix_rule(
+                self._prefix_tries[type(parsed_request)], parsed_request
+            )
+            if index is not None and (best is None or index < best):
+                best = index
+
+        if (
+            self._combined_regex is None
+            and self._hyperscan_db is None
+            and not self._regex_indices
+        ):
+            return best
+
+        # ASCII requests can use the ASCII-exact fast paths (bytes patterns,
+        # Hyperscan); anything else is matched by Python's re alone.
+        # Requests are typed once: bytes, the common case, is checked first.
+        check_separators = self._check_separators
+        if isinstance(parsed_request, bytes):
+            ascii_safe = parsed_request.isascii() and not (
+                check_separators and _INFO_SEPARATORS_BYTES.search(parsed_request)
+            )
+            if ascii_safe and self._bytes_regexes is not None:
+                return self._match_regex_rules(
+                    parsed_request,
+                    ascii_safe,
+                    self._bytes_regexes,
+                    self._combined_regex_bytes,
+                    best,
+                )
+            request_str = parsed_request.decode("utf-8", errors="ignore")
+        elif isinstance(parsed_request, str):
+            ascii_safe = parsed_request.isascii() and not (
+                check_separators and _INFO_SEPARATORS.search(parsed_request)
+            )
+            request_str = parsed_request
+        else:
+            return best
+        return self._match_regex_rules(
+            request_str, ascii_safe, self._str_regexes, self._combined_regex, best
+        )
+
+    def _match_regex_rules(
+        self,
+        subject: Any,
+        ascii_safe: bool,
+        regexes: Any,
+        combined_regex: Optional[Any],
+        best: Optional[int],
+    ) -> Optional[int]:
+        """
+        Returns the first declared regex rule matching, or `best` if earlier.
+
+        Args:
+            subject: The request, as str or (ASCII) bytes.
+            ascii_safe: Whether the subject is ASCII without 0x1c-0x1f when
+                        that matters. Hyperscan only prefilters such subjects:
+                        its patterns were translated for ASCII, so for others
+                        every Hyperscan rule is checked with re instead.
+            regexes: Per-rule patterns of the subject's type, by rule index.
+            combined_regex: The combined pattern of the subject's type.
+            best: Index of the best non-regex match so far, if any.
+        """
+        # Hyperscan rule indices are ascending; skip the scan when an exact or
+        # prefix rule was declared before all of them
+        if self._hyperscan_db is not None and (
+            best is None or best > self._hyperscan_ids[0]
+        ):
+            if ascii_safe:
+                candidates: List[int] = []
+                self._hyperscan_db.scan(
+                    subject if isinstance(subject, bytes) else subject.encode(),
+                    match_event_handler=_collect_hyperscan_match,
+                    context=candidates,
+                )
+                candidates.sort()
+            else:
+                candidates = self._hyperscan_ids
+            for index in candidates:
+                if best is not None and index > best:
+                    break
+                if regexes[index].match(subject):
+                    best = index
+                    break
+
+        if combined_regex is not None:
+            match = combined_regex.match(subject)
+            if match:
+                index = self._combined_table[match.lastindex]
+                if best is None or index < best:
+                    best = index
+
+        for index in self._regex_indices:
+            if best is not None and index > best:
+                break
+            if regexes[index].match(subject):
+                best = index
+                break
+
+        return best
 
     def read_registers(
         self, register_type: str, address: int, count: int
@@ -128,22 +755,27 @@ class RuleEngine:
             List of integer register values if successful, None if error
         """
         if register_type not in self.registers:
-            print(f"Warning: Invalid register type '{register_type}'")
+            logger.warning("Invalid register type '%s'", register_type)
             return None
 
         if address < 0 or count <= 0:
-            print(f"Warning: Invalid address/count: {address}/{count}")
+            logger.warning("Invalid address/count: %s/%s", address, count)
             return None
 
-        registers = self.registers[register_type]
-        values: List[int] = []
-        for offset in range(count):
-            current_addr = address + offset
-            if current_addr in registers:
-                values.append(registers[current_addr])
-            else:
-                values.append(0)
-                print(f"Warning: Unknown register {register_type}:{current_addr}")
+        # One comprehension over the block; unknown registers are rare, so
+        # they are only looked for (and reported) when the sentinel shows up
+        get = self.registers[register_type].get
+        values: List[Any] = [
+            get(current_addr, _MISSING)
+            for current_addr in range(address, address + count)
+        ]
+        if any(value is _MISSING for value in values):
+            for offset, value in enumerate(values):
+                if value is _MISSING:
+                    values[offset] = 0
+                    logger.warning(
+                        "Unknown register %s:%s", register_type, address + offset
+                    )
 
         return values
 
@@ -160,11 +792,11 @@ class RuleEngine:
             True if successful, False if error
         """
         if register_type not in self.registers:
-            print(f"Warning: Invalid register type '{register_type}'")
+            logger.warning("Invalid register type '%s'", register_type)
             return False
 
         if address < 0:
-            print(f"Warning: Invalid address: {address}")
+            logger.warning("Invalid address: %s", address)
             return False
 
         self.registers[register_type][address] = value
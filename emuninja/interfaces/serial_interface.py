@@ -1,6 +1,9 @@
 import asyncio
+import queue
+import random
 import sys
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from loguru import logger
 
@@ -10,8 +13,26 @@ except ImportError:
     logger.error("pyserial is not installed. Please install it: pip install pyserial")
     sys.exit(1)
 
+from ..utils.config import config_bytes
 from .base import CommunicationInterface, DataHandlerCallback
 
+# Unterminated bytes kept before the buffer is discarded (e.g. a peer sending
+# with the wrong terminator would otherwise grow it without bound)
+DEFAULT_MAX_BUFFER_SIZE = 64 * 1024
+
+# Messages whose replies may be pending at once. The reader thread cannot be
+# paused per message like a TCP stream, so further messages are dropped, as
+# by a device whose input queue overflows (bounds memory under a flood of
+# requests for delayed rules)
+MAX_PENDING_REPLIES = 1024
+
+# Reconnect backoff bounds (seconds): the delay doubles per failed attempt
+INITIAL_RECONNECT_DELAY = 0.1
+MAX_RECONNECT_DELAY = 10.0
+
+# How long closing the port waits for each I/O thread to finish (seconds)
+IO_THREAD_JOIN_TIMEOUT = 2.0
+
 
 class SerialInterface(CommunicationInterface):
     def __init__(self, config: Dict[str, Any]):
@@ -22,29 +43,56 @@ class SerialInterface(CommunicationInterface):
 
         protocol_config = config.get("protocol", {})
         term = protocol_config.get("terminator", "\r\n")
-        if isinstance(term, str):
-            self._terminator = term.encode("utf-8")
-        elif isinstance(term, (bytes, bytearray)):
-            self._terminator = bytes(term)
-        else:
+        try:
+            self._terminator = config_bytes(term)
+        except TypeError:
             raise ValueError(
                 f"Invalid terminator type: {type(term)}, expected str or bytes"
             )
         logger.info(f"Using terminator: {self._terminator!r}")
+        self._term_len = len(self._terminator)
+
+        self._max_buffer_size = int(
+            config.get("max_buffer_size", DEFAULT_MAX_BUFFER_SIZE)
+        )
+        if self._max_buffer_size <= 0:
+            raise ValueError(
+                "Serial interface 'max_buffer_size' must be a positive integer"
+            )
 
         self._serial_params = {
-            k: v for k, v in self.config.items() if k not in ["port", "type"]
+            k: v
+            for k, v in self.config.items()
+            if k not in ["port", "type", "max_buffer_size"]
         }
         self._serial_params.setdefault("timeout", 0.1)
 
         self._serial_port: Optional[serial.Serial] = None
         self._listen_task: Optional[asyncio.Task[None]] = None
+        # Replies still being produced (e.g. waiting out a rule delay)
+        self._reply_tasks: Set[asyncio.Task[None]] = set()
+        # The most recent reply task, which the next reply waits for
+        self._last_reply: Optional[asyncio.Task[None]] = None
+        self._data_handler: Optional[DataHandlerCallback] = None
+        # Received bytes not yet terminated; framed as chunks arrive
+        self._buffer = bytearray()
+        # Set once an oversized message was cut, until its terminator arrives
+        self._discarding = False
+        # Resolved when the open port fails (with the error) or on stop (None)
+        self._connection_lost: Optional[asyncio.Future[Optional[Exception]]] = None
+        # Drained by the writer thread; None tells it to exit
+        self._tx_queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        # The threads serving the open port, joined when it is closed
+        self._reader_thread: Optional[threading.Thread] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        # Replies (and terminators) waiting for the end of this loop iteration
+        self._pending_writes: List[bytes] = []
         self._stop_event = asyncio.Event()
-        self._reconnect_delay = 5
+        self._reconnect_delay = INITIAL_RECONNECT_DELAY
 
-    async def _listen(self, data_handler: DataHandlerCallback) -> None:
+    async def _listen(self) -> None:
+        """Supervises the port: waits for it to fail, then reconnects."""
         logger.info(f"Serial listener started on {self.port_name}")
-        buffer = b""
         while not self._stop_event.is_set():
             try:
                 if not self._serial_port or not self._serial_port.is_open:
@@ -53,39 +101,27 @@ class SerialInterface(CommunicationInterface):
                     )
                     await self._close_port()
                     if not await self._open_port():
+                        delay = self._next_reconnect_delay()
                         logger.error(
-                            f"Reconnect failed for {self.port_name}. Waiting {self._reconnect_delay}s..."
+                            f"Reconnect failed for {self.port_name}. Waiting {delay:.2f}s..."
                         )
-                        await asyncio.sleep(self._reconnect_delay)
+                        await asyncio.sleep(delay)
                         continue
                     logger.info(f"Successfully reconnected to {self.port_name}")
+                    self._reconnect_delay = INITIAL_RECONNECT_DELAY
 
-                if self._serial_port:
-                    data = await asyncio.to_thread(self._serial_port.read_all)
-                else:
-                    logger.warning("Serial port is None, skipping read.")
-                    await asyncio.sleep(0.05)
-                    continue
-
-                if data:
-                    buffer += data
-                    logger.debug(f"Buffer updated: {buffer!r}")
-
-                    if self._terminator in buffer:
-                        message, buffer = buffer.split(self._terminator, 1)
-                        logger.debug(f"Complete message received: {message!r}")
-                        response = await data_handler(message)
-                        if response:
-                            await self.send(response)
-                else:
-                    await asyncio.sleep(0.05)
+                if self._connection_lost is None:
+                    raise RuntimeError("Serial listener started before the port")
+                error = await self._connection_lost
+                if error is not None:
+                    raise error
 
             except serial.SerialException as e:
                 logger.error(
                     f"Serial error on {self.port_name}: {e}. Attempting to reconnect..."
                 )
                 await self._close_port()
-                await asyncio.sleep(self._reconnect_delay)
+                await asyncio.sleep(self._next_reconnect_delay())
             except asyncio.CancelledError:
                 logger.info(f"Serial listener cancelled for {self.port_name}")
                 break
@@ -94,10 +130,206 @@ class SerialInterface(CommunicationInterface):
                     f"Unexpected error in serial listener for {self.port_name}: {e}"
                 )
                 await self._close_port()
-                await asyncio.sleep(self._reconnect_delay)
+                await asyncio.sleep(self._next_reconnect_delay())
 
         logger.info(f"Serial listener stopped for {self.port_name}")
 
+    def _next_reconnect_delay(self) -> float:
+        """
+        Returns the wait before the next reconnect attempt, doubling the base.
+
+        The wait is jittered (50-150% of the base) so emulators sharing a bus
+        or USB hub do not retry in lockstep; a successful reconnect resets it.
+        """
+        delay = self._reconnect_delay * (0.5 + random.random())
+        self._reconnect_delay = min(self._reconnect_delay * 2, MAX_RECONNECT_DELAY)
+        return delay
+
+    def _data_received(self, data: bytes) -> None:
+        """
+        Frames a chunk from the reader thread, dispatching complete messages.
+
+        Runs on the event loop, called directly from the reader thread via
+        call_soon_threadsafe (no queue or listener wake-up per chunk).
+        """
+        data_handler = self._data_handler
+        if data_handler is None:
+            return
+        logger.debug("Chunk received: {!r}", data)
+        terminator = self._terminator
+        term_len = self._term_len
+        buffer = self._buffer
+        if buffer:
+            # Only the new bytes (plus a terminator-sized overlap) can complete
+            # a message; earlier bytes were already scanned
+            search_from = max(0, len(buffer) - term_len + 1)
+            buffer.extend(data)
+            source: Any = buffer
+        else:
+            # Usual case, nothing pending: frame the chunk in place and only
+            # buffer an unterminated tail
+            search_from = 0
+            source = data
+
+        term_index = source.find(terminator, search_from)
+        start = 0
+        with memoryview(source) as view:
+            while term_index >= 0:
+                if self._discarding:
+                    # The rest of a message whose start was already discarded
+                    self._discarding = False
+                elif len(self._reply_tasks) >= MAX_PENDING_REPLIES:
+                    logger.warning(
+                        "Dropping message on {}: {} replies already pending",
+                        self.port_name,
+                        MAX_PENDING_REPLIES,
+                    )
+                else:
+                    self._dispatch(bytes(view[start:term_index]), data_handler)
+                start = term_index + term_len
+                term_index = source.find(terminator, start)
+            if source is data and start < len(data):
+                buffer.extend(view[start:])
+        if source is buffer and start:
+            # Compact once per chunk instead of once per message
+            del buffer[:start]
+        if len(buffer) > self._max_buffer_size:
+            logger.warning(
+                f"Discarding {len(buffer)} unterminated bytes on {self.port_name} "
+                f"(max_buffer_size is {self._max_buffer_size}), up to the next "
+                "terminator"
+            )
+            buffer.clear()
+            self._discarding = True
+
+    def _dispatch(self, message: bytes, data_handler: DataHandlerCallback) -> None:
+        """Starts the reply to a complete message."""
+        logger.debug("Complete message received: {!r}", message)
+        # Reply in the background so a rule delay does not hold up reading
+        # the messages that follow; each reply still waits for the one
+        # before it, so replies keep the request order
+        reply_task = asyncio.create_task(
+            self._reply(message, data_handler, self._last_reply)
+        )
+        self._last_reply = reply_task
+        self._reply_tasks.add(reply_task)
+        reply_task.add_done_callback(self._reply_tasks.discard)
+
+    @staticmethod
+    def _lose_connection(
+        connection_lost: "asyncio.Future[Optional[Exception]]",
+        error: Optional[Exception],
+    ) -> None:
+        """Resolves a connection's lost future, keeping the first cause."""
+        if not connection_lost.done():
+            connection_lost.set_result(error)
+
+    async def _reply(
+        self,
+        message: bytes,
+        data_handler: DataHandlerCallback,
+        previous: Optional[asyncio.Task[None]],
+    ) -> None:
+        """
+        Produces the reply to one message and queues it for writing.
+
+        Args:
+            message: The received message, without its terminator.
+            data_handler: The async callback function for processing data.
+            previous: The reply task of the preceding message, if any; its
+                      reply is queued first, even if this one is ready sooner.
+        """
+        try:
+            response = await data_handler(message)
+        except Exception as e:
+            logger.error(f"Error in data handler for serial {self.port_name}: {e}")
+            response = None
+        if previous is not None and not previous.done():
+            await asyncio.wait((previous,))
+        if response:
+            self._queue_send(response)
+
+    def _start_io_threads(self, port: serial.Serial) -> None:
+        """Starts the reader and writer threads serving a freshly opened port."""
+        loop = asyncio.get_running_loop()
+        # Per connection, so a late error from an old port's threads cannot
+        # tear down its replacement
+        connection_lost: asyncio.Future[Optional[Exception]] = loop.create_future()
+        self._connection_lost = connection_lost
+
+        def on_error(error: Exception) -> None:
+            loop.call_soon_threadsafe(self._lose_connection, connection_lost, error)
+
+        self._tx_queue = queue.Queue()
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop,
+            args=(port, loop, self._data_received, on_error),
+            name=f"SerialReader-{self.port_name}",
+            daemon=True,
+        )
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            args=(port, self._tx_queue, on_error),
+            name=f"SerialWriter-{self.port_name}",
+            daemon=True,
+        )
+        self._reader_thread.start()
+        self._writer_thread.start()
+
+    @staticmethod
+    def _reader_loop(
+        port: serial.Serial,
+        loop: asyncio.AbstractEventLoop,
+        on_data: Callable[[bytes], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        """
+        Blocks on the port and hands received chunks to the event loop.
+
+        Each read waits for at least one byte (up to the port timeout) and then
+        drains everything already buffered by the OS in a single call.
+        """
+        try:
+            while port.is_open:
+                data = port.read(max(1, port.in_waiting))
+                if data:
+                    loop.call_soon_threadsafe(on_data, data)
+        except Exception as e:
+            if port.is_open:
+                on_error(e)
+
+    @staticmethod
+    def _writer_loop(
+        port: serial.Serial,
+        tx_queue: "queue.Queue[Optional[bytes]]",
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        """
+        Writes queued messages, coalescing whatever is pending into one write.
+
+        write() returns once the OS has the bytes, so the next batch can be
+        queued behind them; the port is only drained (flush) before exiting.
+        """
+        running = True
+        while running:
+            chunks: List[bytes] = []
+            data = tx_queue.get()
+            while data is not None:
+                chunks.append(data)
+                if tx_queue.empty():
+                    break
+                data = tx_queue.get_nowait()
+            running = data is not None
+            try:
+                if chunks:
+                    port.write(b"".join(chunks))
+                if not running:
+                    port.flush()
+            except Exception as e:
+                if port.is_open:
+                    on_error(e)
+                return
+
     async def _open_port(self) -> bool:
         if self._serial_port and self._serial_port.is_open:
             return True
@@ -112,6 +344,7 @@ class SerialInterface(CommunicationInterface):
                 logger.info(f"Serial port {self.port_name} opened successfully.")
                 await asyncio.to_thread(self._serial_port.reset_input_buffer)
                 await asyncio.to_thread(self._serial_port.reset_output_buffer)
+                self._start_io_threads(self._serial_port)
                 return True
             logger.error(
                 f"Serial port {self.port_name} failed to open (is_open is false after construction)."
@@ -130,6 +363,18 @@ class SerialInterface(CommunicationInterface):
     async def _close_port(self) -> None:
         port_to_close = self._serial_port
         self._serial_port = None
+        reader_thread, self._reader_thread = self._reader_thread, None
+        writer_thread, self._writer_thread = self._writer_thread, None
+        # Hand over replies still batched for this loop iteration, then let
+        # the writer thread write and flush everything before the port closes
+        self._flush_writes()
+        self._tx_queue.put_nowait(None)
+        if writer_thread is not None:
+            await asyncio.to_thread(writer_thread.join, IO_THREAD_JOIN_TIMEOUT)
+            if writer_thread.is_alive():
+                logger.warning(
+                    f"Serial writer for {self.port_name} did not finish in time"
+                )
 
         if port_to_close and port_to_close.is_open:
             try:
@@ -138,11 +383,15 @@ class SerialInterface(CommunicationInterface):
                 logger.info(f"Serial port {self.port_name} closed.")
             except Exception as e:
                 logger.error(f"Error closing serial port {self.port_name}: {e}")
+        # The reader thread exits once its port is closed
+        if reader_thread is not None:
+            await asyncio.to_thread(reader_thread.join, IO_THREAD_JOIN_TIMEOUT)
 
     async def start(self, data_handler: DataHandlerCallback) -> None:
         self._stop_event.clear()
+        self._data_handler = data_handler
         if await self._open_port():
-            self._listen_task = asyncio.create_task(self._listen(data_handler))
+            self._listen_task = asyncio.create_task(self._listen())
         else:
             logger.error(
                 f"Could not start SerialInterface, port {self.port_name} failed to open initially."
@@ -154,6 +403,9 @@ class SerialInterface(CommunicationInterface):
     async def stop(self) -> None:
         logger.info(f"Stopping serial interface for {self.port_name}...")
         self._stop_event.set()
+        if self._connection_lost is not None:
+            # Wake the listener if it is waiting on the open port
+            self._lose_connection(self._connection_lost, None)
 
         listen_task = self._listen_task
         self._listen_task = None
@@ -179,36 +431,41 @@ class SerialInterface(CommunicationInterface):
                     f"Error waiting for listener task {self.port_name} to stop gracefully: {e}"
                 )
 
+        self._data_handler = None
+        if self._reply_tasks:
+            # Let pending (delayed) replies go out before the port closes
+            await asyncio.gather(*self._reply_tasks, return_exceptions=True)
+
         await self._close_port()
         logger.info(f"Serial interface for {self.port_name} stopped.")
 
     async def send(self, data: bytes) -> None:
+        self._queue_send(data)
+
+    def _queue_send(self, data: bytes) -> None:
+        # Plain method: queueing never blocks, so replies skip a coroutine hop
         port_to_write = self._serial_port
         if port_to_write and port_to_write.is_open:
-            try:
-                # Append terminator to the message
-                message_with_terminator = data + self._terminator
-                bytes_written = await asyncio.to_thread(
-                    port_to_write.write, message_with_terminator
-                )
-                await asyncio.to_thread(port_to_write.flush)
-                logger.debug(
-                    f"Sent {bytes_written} bytes via serial {self.port_name}: {message_with_terminator!r}"
-                )
-            except serial.SerialTimeoutException as e:
-                logger.error(f"Timeout sending data via serial {self.port_name}: {e}")
-                await self._close_port()
-            except serial.SerialException as e:
-                logger.error(
-                    f"Serial error sending data via serial {self.port_name}: {e}"
-                )
-                await self._close_port()
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error sending data via serial {self.port_name}: {e}"
-                )
-                await self._close_port()
+            # Replies produced in the same loop iteration are handed to the
+            # writer thread as one buffer (one wake-up, one write)
+            if not self._pending_writes:
+                asyncio.get_running_loop().call_soon(self._flush_writes)
+            self._pending_writes.append(data)
+            self._pending_writes.append(self._terminator)
+            logger.debug(
+                "Queued {} bytes for serial {}: {!r}",
+                len(data) + len(self._terminator),
+                self.port_name,
+                data,
+            )
         else:
             logger.warning(
                 f"Cannot send data, serial port {self.port_name} is not open or available"
             )
+
+    def _flush_writes(self) -> None:
+        """Passes the replies batched this loop iteration to the writer thread."""
+        chunks, self._pending_writes = self._pending_writes, []
+        if chunks:
+            # The writer thread reports failures to the listener
+            self._tx_queue.put_nowait(b"".join(chunks))
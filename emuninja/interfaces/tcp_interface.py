@@ -1,11 +1,27 @@
 import asyncio
 import logging
-from typing import Any, Awaitable, Dict, List, Optional, Set
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from ..utils.config import config_bytes
 from .base import CommunicationInterface, DataHandlerCallback
 
 logger = logging.getLogger(__name__)
 
+# Bytes requested per read: large enough that bulk payloads (e.g. SCPI binary
+# blocks) arrive in one chunk instead of being copied out 1 KiB at a time
+DEFAULT_READ_SIZE = 64 * 1024
+
+# Replies a client may have in flight before its reads are paused (backpressure
+# against a client that pipelines requests faster than they are answered)
+MAX_PENDING_REPLIES = 16
+
+# Clients served at once; further connections are closed on accept
+DEFAULT_MAX_CONNECTIONS = 256
+
+# Logged in place of the address of a client whose transport has none
+UNKNOWN_PEER = "Unknown Client"
+
 
 class TcpServerInterface(CommunicationInterface):
     """
@@ -20,10 +36,19 @@ class TcpServerInterface(CommunicationInterface):
         Initializes the TCP server interface.
 
         Args:
-            config: Configuration dictionary containing 'host' (str) and 'port' (int).
+            config: Configuration dictionary containing 'host' (str) and 'port' (int),
+                and optionally 'read_size' (int, bytes requested per read and size
+                of each client's stream buffer; defaults to 64 KiB),
+                'terminator' (str or bytes; when set, requests are framed on it
+                and handed to the data handler one message at a time, without
+                the terminator, so it cannot be used with handlers that frame
+                on the terminator themselves, such as SCPI) and
+                'max_connections' (int, clients served at once; defaults to
+                256).
 
         Raises:
-            ValueError: If 'host' or 'port' is missing in the config.
+            ValueError: If 'host' or 'port' is missing in the config, or an
+                option has an invalid value.
         """
         super().__init__(config)
         self.host: Optional[str] = config.get("host")
@@ -32,9 +57,31 @@ class TcpServerInterface(CommunicationInterface):
             msg = "TCP interface config missing 'host' or 'port'"
             logger.error(msg + f". Config provided: {config}")
             raise ValueError(msg)
+        self.read_size: int = int(config.get("read_size", DEFAULT_READ_SIZE))
+        if self.read_size <= 0:
+            msg = "TCP interface 'read_size' must be a positive integer"
+            logger.error(msg + f". Config provided: {config}")
+            raise ValueError(msg)
+        terminator = config.get("terminator")
+        try:
+            self.terminator: Optional[bytes] = (
+                config_bytes(terminator) if terminator else None
+            )
+        except TypeError:
+            msg = "TCP interface 'terminator' must be str or bytes"
+            logger.error(msg + f". Config provided: {config}")
+            raise ValueError(msg)
+        self.max_connections: int = int(
+            config.get("max_connections", DEFAULT_MAX_CONNECTIONS)
+        )
+        if self.max_connections <= 0:
+            msg = "TCP interface 'max_connections' must be a positive integer"
+            logger.error(msg + f". Config provided: {config}")
+            raise ValueError(msg)
 
         self._server: Optional[asyncio.AbstractServer] = None
-        self._writers: Set[asyncio.StreamWriter] = set()
+        # Connected clients' writers -> their address, looked up once
+        self._writers: Dict[asyncio.StreamWriter, Any] = {}
         self._server_task: Optional[asyncio.Task[None]] = None
         # Specify the Task type argument as None since the coroutine returns None
         self._client_handler_tasks: Set[asyncio.Task[None]] = set()
@@ -50,14 +97,29 @@ class TcpServerInterface(CommunicationInterface):
         """
         Coroutine to handle communication with a single connected client.
         """
-        peername = writer.get_extra_info("peername", "Unknown Client")
+        peername = writer.get_extra_info("peername", UNKNOWN_PEER)
         logger.info(f"Client connected: {peername}")
-        self._writers.add(writer)
+        self._writers[writer] = peername
+        reply_tasks: Set[asyncio.Task[Optional[bytes]]] = set()
+        # Reply tasks in request order, written out by a single writer task;
+        # bounded, so a client pipelining requests faster than they are
+        # answered has its reads paused
+        replies: "asyncio.Queue[Optional[asyncio.Task[Optional[bytes]]]]" = (
+            asyncio.Queue(MAX_PENDING_REPLIES)
+        )
+        writer_task = asyncio.create_task(
+            self._write_replies(writer, replies, peername)
+        )
+        cancelled = False
 
+        terminator = self.terminator
         try:
             while True:
                 try:
-                    data = await reader.read(1024)
+                    if terminator is None:
+                        data = await reader.read(self.read_size)
+                    else:
+                        data = await self._read_message(reader, terminator, peername)
                 except ConnectionError as e:
                     logger.warning(f"Connection error reading from {peername}: {e}")
                     break
@@ -66,31 +128,35 @@ class TcpServerInterface(CommunicationInterface):
                     logger.info(f"Client disconnected: {peername} (EOF received)")
                     break
 
-                logger.debug(f"Received {len(data)} bytes from {peername}: {data!r}")
+                logger.debug("Received %d bytes from %s: %r", len(data), peername, data)
 
-                try:
-                    response = await data_handler(data)
-                    if response:
-                        logger.debug(
-                            f"Sending {len(response)} bytes to {peername}: {response!r}"
-                        )
-                        writer.write(response)
-                        await writer.drain()
-                except Exception as e:
-                    logger.error(
-                        f"Error in data_handler for {peername}: {e}", exc_info=True
-                    )
+                # Compute the reply in the background so a rule delay does not
+                # stop this loop from reading the client's next request
+                reply_task: asyncio.Task[Optional[bytes]] = asyncio.create_task(
+                    self._reply(data, data_handler, peername)
+                )
+                reply_tasks.add(reply_task)
+                reply_task.add_done_callback(reply_tasks.discard)
+                await replies.put(reply_task)
 
         except asyncio.CancelledError:
             logger.info(f"Client handler cancelled for {peername}")
+            cancelled = True
+            writer_task.cancel()
+            for reply_task in reply_tasks:
+                reply_task.cancel()
             raise
         except Exception as e:
             logger.error(
                 f"Unexpected error handling client {peername}: {e}", exc_info=True
             )
         finally:
+            if not cancelled and not writer_task.done():
+                # Let pending (delayed) replies go out before closing the stream
+                await replies.put(None)
+            await asyncio.gather(writer_task, *reply_tasks, return_exceptions=True)
             logger.debug(f"Cleaning up connection for {peername}")
-            self._writers.discard(writer)
+            self._writers.pop(writer, None)
             if not writer.is_closing():
                 try:
                     writer.close()
@@ -99,6 +165,130 @@ class TcpServerInterface(CommunicationInterface):
                     logger.warning(f"Error/Timeout closing writer for {peername}: {e}")
             logger.info(f"Client handler finished for {peername}")
 
+    async def _read_message(
+        self, reader: asyncio.StreamReader, terminator: bytes, peername: Any
+    ) -> bytes:
+        """
+        Reads the client's next message, framed on the configured terminator.
+
+        The StreamReader finds the terminator in its own buffer, so messages
+        reach the data handler already split, without being scanned again.
+
+        Args:
+            reader: The client's stream reader.
+            terminator: The configured message terminator.
+            peername: The client address, used for logging.
+
+        Returns:
+            The message without its terminator (empty messages are skipped),
+            the unterminated bytes left when the client closes, or b"" at EOF.
+            A message longer than read_size is discarded whole, up to and
+            including its terminator.
+        """
+        discarding = False
+        while True:
+            try:
+                message = await reader.readuntil(terminator)
+            except asyncio.IncompleteReadError as e:
+                return b"" if discarding else e.partial
+            except asyncio.LimitOverrunError as e:
+                # No terminator within read_size bytes: drop what was buffered,
+                # and the rest of the message once its terminator arrives
+                logger.warning(
+                    f"Discarding {e.consumed} unterminated bytes from {peername} "
+                    f"(read_size is {self.read_size})"
+                )
+                await reader.readexactly(e.consumed)
+                discarding = True
+                continue
+            if discarding:
+                discarding = False
+            elif len(message) > len(terminator):
+                return message[: -len(terminator)]
+
+    async def _reply(
+        self, data: bytes, data_handler: DataHandlerCallback, peername: Any
+    ) -> Optional[bytes]:
+        """
+        Runs the data handler for one request.
+
+        Args:
+            data: The bytes received from the client.
+            data_handler: The async callback function for processing data.
+            peername: The client address, used for logging.
+
+        Returns:
+            The response, or None if there is none or the handler failed.
+        """
+        try:
+            return await data_handler(data)
+        except Exception as e:
+            logger.error(f"Error in data_handler for {peername}: {e}", exc_info=True)
+            return None
+
+    async def _write_replies(
+        self,
+        writer: asyncio.StreamWriter,
+        replies: "asyncio.Queue[Optional[asyncio.Task[Optional[bytes]]]]",
+        peername: Any,
+    ) -> None:
+        """
+        Writes a client's replies in the order its requests arrived.
+
+        Replies are computed concurrently, but each is written only after all
+        earlier ones, so a delayed rule never lets a later reply overtake it.
+        The finished replies queued behind the one awaited (e.g. answers to
+        pipelined requests) are handed to the transport with it in one
+        writelines() call, so they leave in one send.
+
+        Args:
+            writer: The client's stream writer.
+            replies: The client's reply tasks, in request order; None ends.
+            peername: The client address, used for logging.
+        """
+        reply = await replies.get()
+        while reply is not None:
+            await asyncio.wait((reply,))
+            batch: List[bytes] = []
+            while True:
+                response = None if reply.cancelled() else reply.result()
+                if response:
+                    logger.debug(
+                        "Sending %d bytes to %s: %r", len(response), peername, response
+                    )
+                    batch.append(response)
+                if replies.empty():
+                    wait_for_next = True
+                    break
+                reply = replies.get_nowait()
+                if reply is None or not reply.done():
+                    wait_for_next = False
+                    break
+            if batch and not writer.is_closing():
+                try:
+                    writer.writelines(batch)
+                    await self._maybe_drain(writer)
+                except Exception as e:
+                    # Keep consuming replies: the read loop must be able to
+                    # queue its end-of-stream marker
+                    logger.warning(f"Error sending reply to {peername}: {e}")
+            if wait_for_next:
+                reply = await replies.get()
+
+    @staticmethod
+    async def _maybe_drain(writer: asyncio.StreamWriter) -> None:
+        """
+        Waits for the client to catch up, only if its write buffer is backed up.
+
+        drain() can only block while writing is paused, i.e. once the buffer
+        went over its high-water mark and has not yet fallen to the low one;
+        small replies to a reading client skip the call entirely.
+        """
+        transport = writer.transport
+        low, _ = transport.get_write_buffer_limits()
+        if transport.get_write_buffer_size() > low:
+            await writer.drain()
+
     def _create_client_handler_task(
         self,
         reader: asyncio.StreamReader,
@@ -106,10 +296,18 @@ class TcpServerInterface(CommunicationInterface):
         data_handler: DataHandlerCallback,
     ):
         """Creates and tracks the task for handling a client."""
+        if len(self._client_handler_tasks) >= self.max_connections:
+            # Refuse rather than queue, so memory stays bounded under a flood
+            logger.warning(
+                f"Refusing client {writer.get_extra_info('peername', UNKNOWN_PEER)}: "
+                f"{self.max_connections} clients already connected"
+            )
+            writer.close()
+            return
         # Specify the Task type argument as None
         task: asyncio.Task[None] = asyncio.create_task(
             self._handle_client(reader, writer, data_handler),
-            name=f"TCPClientHandler-{writer.get_extra_info('peername', 'Unknown')}",
+            name=f"TCPClientHandler-{writer.get_extra_info('peername', UNKNOWN_PEER)}",
         )
         self._client_handler_tasks.add(task)
         task.add_done_callback(
@@ -135,14 +333,13 @@ class TcpServerInterface(CommunicationInterface):
 
         logger.info(f"Starting TCP server on {self.host}:{self.port}")
         try:
-            # Define the callback as a nested function for clearer type handling
-            def client_connected_cb(
-                reader: asyncio.StreamReader, writer: asyncio.StreamWriter
-            ):
-                self._create_client_handler_task(reader, writer, data_handler)
-
+            # Bind the handler with partial (called in C, no wrapper frame
+            # per accepted connection)
+            client_connected_cb = partial(
+                self._create_client_handler_task, data_handler=data_handler
+            )
             self._server = await asyncio.start_server(
-                client_connected_cb, self.host, self.port
+                client_connected_cb, self.host, self.port, limit=self.read_size
             )
 
             self._server_task = asyncio.create_task(
@@ -202,9 +399,12 @@ class TcpServerInterface(CommunicationInterface):
             tasks_to_cancel = list(self._client_handler_tasks)
             for task in tasks_to_cancel:
                 task.cancel()
-            # Wait for tasks to finish cancellation
-            # No need to capture results here, just wait for completion/exceptions
-            await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
+            # Wait for tasks to finish cancellation; wait() collects no
+            # per-task results, unlike gather()
+            done, _ = await asyncio.wait(tasks_to_cancel)
+            for task in done:
+                if not task.cancelled():
+                    task.exception()  # Retrieved: handlers log their own errors
             logger.debug("Finished waiting for client tasks cancellation.")
             # Tasks remove themselves via done_callback, but clear just in case
             self._client_handler_tasks.clear()
@@ -213,24 +413,21 @@ class TcpServerInterface(CommunicationInterface):
         if self._writers:
             logger.debug(f"Closing {len(self._writers)} remaining writer streams...")
             writers_to_close = list(self._writers)  # Create copy
-            self._writers.clear()  # Clear original set
-            # Type hint for list of awaitables returning None or raising
-            close_tasks: List[Awaitable[None]] = []
+            self._writers.clear()  # Clear original registry
+            # close() does not block: close every writer first, then wait for
+            # all of them against a single deadline
+            close_tasks: List[asyncio.Task[None]] = []
             for writer in writers_to_close:
-                # Removed unused peername variable
                 if not writer.is_closing():
                     writer.close()
-                    close_tasks.append(
-                        asyncio.wait_for(
-                            writer.wait_closed(), timeout=2.0
-                        )  # Shorter timeout here
-                    )
+                    close_tasks.append(asyncio.ensure_future(writer.wait_closed()))
             if close_tasks:
-                # Gather tasks that wait for writer close (return None or raise BaseException)
-                # Assign to _ to indicate result is unused but provide type hint
-                _: list[None | BaseException] = await asyncio.gather(
-                    *close_tasks, return_exceptions=True
-                )
+                done, pending = await asyncio.wait(close_tasks, timeout=2.0)
+                for task in pending:
+                    task.cancel()
+                for task in done:
+                    if not task.cancelled():
+                        task.exception()  # Retrieved: close errors are not reported
                 logger.debug("Finished closing remaining writer streams.")
 
         # 4. Cancel the main server task
@@ -267,43 +464,54 @@ class TcpServerInterface(CommunicationInterface):
             return
 
         logger.debug(
-            f"Broadcasting {len(data)} bytes to {len(self._writers)} clients on {self.host}:{self.port}"
+            "Broadcasting %d bytes to %d clients on %s:%s",
+            len(data),
+            len(self._writers),
+            self.host,
+            self.port,
         )
-        # Type hint for list of awaitables returning bool or raising
-        send_tasks: List[Awaitable[bool]] = []
-        writers_copy = list(self._writers)  # Copy for safe iteration
-
-        for writer in writers_copy:
-            if not writer.is_closing():
-                peername = writer.get_extra_info("peername", "Unknown")
-
-                async def send_to_writer(w: asyncio.StreamWriter, d: bytes, pn: str):
-                    try:
-                        w.write(d)
-                        await w.drain()
-                        return True
-                    except (ConnectionError, Exception) as e:
-                        logger.warning(
-                            f"Send ({self.host}:{self.port}): Failed sending to {pn}: {e}"
-                        )
-                        # Attempt to close writer if send fails
-                        if not w.is_closing():
-                            w.close()
-                        return False
-
-                send_tasks.append(send_to_writer(writer, data, peername))
-            else:
+        # Write to every client first: write() only appends to the transport
+        # buffer, so the sends go out back to back and only drains can wait
+        attempted = 0
+        written: List[Tuple[asyncio.StreamWriter, Any]] = []
+        # No copy needed: nothing in this loop awaits, so clients cannot
+        # connect or disconnect while it runs
+        for writer, peername in self._writers.items():
+            if writer.is_closing():
                 logger.debug(
-                    f"Send ({self.host}:{self.port}): Skipping closing writer for {writer.get_extra_info('peername', 'Unknown')}"
+                    "Send (%s:%s): Skipping closing writer for %s",
+                    self.host,
+                    self.port,
+                    peername,
                 )
+                continue
+            attempted += 1
+            try:
+                writer.write(data)
+            except Exception as e:
+                self._broadcast_failed(writer, peername, e)
+            else:
+                written.append((writer, peername))
 
-        # Gather tasks that send data (return bool or raise BaseException)
-        results: list[bool | BaseException] = await asyncio.gather(
-            *send_tasks, return_exceptions=True
+        results: list[None | BaseException] = await asyncio.gather(
+            *(writer.drain() for writer, _ in written), return_exceptions=True
         )
-        # Filter out exceptions and count True results for success
-        success_count = sum(1 for r in results if isinstance(r, bool) and r is True)
-        # Use len(results) which has the correct type hint now
+        success_count = 0
+        for (writer, peername), result in zip(written, results):
+            if isinstance(result, BaseException):
+                self._broadcast_failed(writer, peername, result)
+            else:
+                success_count += 1
         logger.info(
-            f"Broadcast ({self.host}:{self.port}) complete: {success_count}/{len(results)} successful."
+            f"Broadcast ({self.host}:{self.port}) complete: {success_count}/{attempted} successful."
+        )
+
+    def _broadcast_failed(
+        self, writer: asyncio.StreamWriter, peername: Any, error: BaseException
+    ):
+        """Logs a failed broadcast to one client and closes its stream."""
+        logger.warning(
+            f"Send ({self.host}:{self.port}): Failed sending to {peername}: {error}"
         )
+        if not writer.is_closing():
+            writer.close()
@@ -1,9 +1,46 @@
-from typing import Dict, Any, Optional
+import logging
+from typing import Dict, Any, Optional, Tuple
 
 from .base import ProtocolHandler, RuleEngine
 
 # from pymodbus.datastore import ModbusSlaveContext, ModbusServerContext # Example import
 
+logger = logging.getLogger(__name__)
+
+
+def _build_crc16_table() -> Tuple[int, ...]:
+    """Precompute the CRC-16/Modbus lookup table (reflected poly 0xA001)."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _build_crc16_table()
+
+
+def crc16_modbus(data: bytes) -> int:
+    """
+    Computes the CRC-16/Modbus checksum of ``data``.
+
+    Uses a precomputed 256-entry table so each byte costs a single lookup
+    instead of eight shift/xor rounds.
+
+    Args:
+        data: Bytes-like object to checksum.
+
+    Returns:
+        The 16-bit CRC; on the wire it is sent low byte first.
+    """
+    crc = 0xFFFF
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
 
 class ModbusRtuProtocolHandler(ProtocolHandler):
     """
@@ -20,15 +57,26 @@ class ModbusRtuProtocolHandler(ProtocolHandler):
         # Example:
         # store = ModbusSlaveContext(...)
         # self.context = ModbusServerContext(slaves=store, single=True)
-        print(f"ModbusRTUHandler initialized for unit ID {self.unit_id}")
+        logger.info("ModbusRTUHandler initialized for unit ID %s", self.unit_id)
 
     async def handle_data(self, received_data: bytes) -> Optional[bytes]:
         """
         Processes Modbus RTU frames. (Placeholder)
         """
-        print(f"ModbusRTUHandler received {len(received_data)} bytes.")
-        # 1. Validate CRC
-        # 2. Check Unit ID
+        logger.debug("ModbusRTUHandler received %d bytes.", len(received_data))
+        if len(received_data) < 4:
+            logger.debug("Modbus RTU frame too short (%d bytes).", len(received_data))
+            return None
+        # 1. Check Unit ID first: on a shared bus most frames are addressed to
+        #    other devices, and those are dropped without computing their CRC
+        unit_id = received_data[0]
+        if unit_id != self.unit_id and unit_id != 0:  # 0 is the broadcast address
+            return None
+        # 2. Validate CRC
+        expected_crc = int.from_bytes(received_data[-2:], "little")
+        if crc16_modbus(received_data[:-2]) != expected_crc:
+            logger.warning("Modbus RTU frame CRC mismatch, discarding.")
+            return None
         # 3. Parse PDU (Function Code, Address, Data/Count)
         # 4. Perform action using self.rule_engine (read/write registers)
         #    or potentially self.context if using pymodbus datastore directly.
@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional, Union, cast
 from dataclasses import dataclass
 import asyncio
 import logging
+import struct
 
 # PyModbus Imports - Ensure pymodbus is installed
 from pymodbus.datastore import ModbusSlaveContext, ModbusServerContext
@@ -20,6 +21,9 @@ ModbusRegistersConfig = Dict[str, ModbusRegisterConfig]
 
 logger = logging.getLogger(__name__)
 
+# MBAP header: transaction id, protocol id, length, unit id (big-endian)
+_MBAP_HEADER = struct.Struct(">HHHB")
+
 
 @dataclass
 class ModbusResponseFrame:
@@ -33,13 +37,10 @@ class ModbusResponseFrame:
 
     def to_bytes(self) -> bytes:
         """Convert the frame to bytes."""
-        return (
-            self.transaction_id.to_bytes(2, "big")
-            + self.protocol_id.to_bytes(2, "big")
-            + self.length.to_bytes(2, "big")
-            + self.unit_id.to_bytes(1, "big")
-            + self.pdu
+        header = _MBAP_HEADER.pack(
+            self.transaction_id, self.protocol_id, self.length, self.unit_id
         )
+        return header + self.pdu
 
 
 class ModbusTcpProtocolHandler(ProtocolHandler):
@@ -84,20 +85,19 @@ class ModbusTcpProtocolHandler(ProtocolHandler):
     ) -> Dict[int, ModbusRegisterValue]:
         """Helper to parse register values from the config structure."""
         parsed: Dict[int, ModbusRegisterValue] = {}
+        default: ModbusRegisterValue = (
+            0 if register_type in ("holding_registers", "input_registers") else False
+        )
         # Config stores registers as { addr: [value, description] }
         for addr, data in registers_config.get(register_type, {}).items():
-            if isinstance(data, list) and len(data) > 0:
+            if isinstance(data, list) and data:
                 parsed[addr] = data[0]  # Extract only the value
             else:
                 # Fallback or warning for unexpected format
                 logger.warning(
-                    f"Unexpected format for {register_type} at address {addr}: {data}. Using 0/False."
-                )
-                parsed[addr] = (
-                    0
-                    if register_type in ["holding_registers", "input_registers"]
-                    else False
+                    f"Unexpected format for {register_type} at address {addr}: {data}. Using {default}."
                 )
+                parsed[addr] = default
         return parsed
 
     def _create_identity(self) -> ModbusDeviceIdentification:
@@ -1,10 +1,11 @@
 import asyncio  # Added import
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
 from loguru import logger  # Import loguru
 
 from .base import ProtocolHandler, RuleEngine
 from ..core.rules import RuleMatch  # Import RuleMatch
+from ..utils.config import config_bytes
 
 
 class RawProtocolHandler(ProtocolHandler):
@@ -18,76 +19,89 @@ class RawProtocolHandler(ProtocolHandler):
         super().__init__(config, rule_engine)
         self.encoding = config.get("encoding", "utf-8")
         self.terminator = config.get("terminator", b"\n")
+        # Terminator as bytes, precomputed so it can be sliced off each message
+        self._terminator_bytes = config_bytes(self.terminator, self.encoding)
+        self._terminator_len = len(self._terminator_bytes)
+        # The rule engine matches ASCII bytes exactly like the same text, so
+        # with an ASCII-compatible encoding ASCII requests need no decode
+        ascii_chars = bytes(range(128))
+        try:
+            self._ascii_compatible = ascii_chars.decode(
+                self.encoding
+            ) == ascii_chars.decode("ascii")
+        except (LookupError, UnicodeDecodeError):
+            self._ascii_compatible = False
+        # Encode all responses up front instead of on their first match
+        self.rule_engine.encode_responses(self.encoding)
 
     async def handle_data(self, received_data: bytes) -> Optional[bytes]:
         """
         Handles raw data by finding a matching rule, applying delay, and returning the response.
         """
-        logger.debug(f"RawHandler received {len(received_data)} bytes.")
-        decoded_data_str: Optional[str] = None
-        try:
-            decoded_data_str = received_data.decode(self.encoding)
-            logger.trace(
-                f"RawHandler received raw bytes: {received_data!r}, decoded: {decoded_data_str!r}"
-            )
-        except UnicodeDecodeError as e:
-            logger.warning(
-                f"RawHandler: Cannot decode received bytes using {self.encoding}: {e}"
-            )
-            # Optionally try matching raw bytes if decoding fails?
-            # For now, return None if we can't decode to the expected string format.
-            return None
+        logger.debug("RawHandler received {} bytes.", len(received_data))
+        # Stream interfaces deliver the terminator with the payload; slice it
+        # off once instead of making every rule account for it
+        if self._terminator_len and received_data.endswith(self._terminator_bytes):
+            received_data = received_data[: -self._terminator_len]
+        request: Union[bytes, str]
+        if self._ascii_compatible and received_data.isascii():
+            request = received_data
+            logger.trace("RawHandler received raw bytes: {!r}", received_data)
+        else:
+            try:
+                request = received_data.decode(self.encoding)
+                logger.trace(
+                    "RawHandler received raw bytes: {!r}, decoded: {!r}",
+                    received_data,
+                    request,
+                )
+            except UnicodeDecodeError as e:
+                logger.warning(
+                    f"RawHandler: Cannot decode received bytes using {self.encoding}: {e}"
+                )
+                # Optionally try matching raw bytes if decoding fails?
+                # For now, return None if we can't decode to the expected string format.
+                return None
 
-        # Directly pass the decoded string to the rule engine
+        # Pass the request (ASCII bytes or decoded string) to the rule engine
         logger.debug(
-            f"RawHandler calling rule_engine.find_response with: {decoded_data_str!r}"
+            "RawHandler calling rule_engine.find_response with: {!r}",
+            request,
         )
-        match: Optional[RuleMatch] = self.rule_engine.find_response(decoded_data_str)
+        match: Optional[RuleMatch] = self.rule_engine.find_response(request)
 
         if match:
             logger.debug(
-                f"RawHandler found match: response={match.response!r}, delay={match.delay}s"
+                "RawHandler found match: response={!r}, delay={}s",
+                match.response,
+                match.delay,
             )
 
             # Apply delay if specified
             if match.delay > 0:
-                logger.debug(f"RawHandler applying delay: {match.delay}s")
+                logger.debug("RawHandler applying delay: {}s", match.delay)
                 await asyncio.sleep(match.delay)
 
-            # Prepare the response bytes
-            response_value = match.response
-            response_bytes: Optional[bytes] = None
-            if isinstance(response_value, str):
-                response_bytes = response_value.encode(self.encoding)
-            elif isinstance(response_value, bytes):
-                response_bytes = (
-                    response_value  # Assume bytes response is already correct
+            # Encoded bytes are cached on the match after the first hit
+            try:
+                response_bytes = match.as_bytes(self.encoding)
+            except Exception as e:
+                logger.error(
+                    f"RawHandler: Failed to encode response {match.response!r}: {e}"
                 )
-            elif response_value is not None:
-                # Attempt to convert other types to string then encode
-                try:
-                    response_bytes = str(response_value).encode(self.encoding)
-                except Exception as e:
-                    logger.error(
-                        f"RawHandler: Failed to encode response {response_value!r}: {e}"
-                    )
-                    # Return None on encoding error
-                    return None
-            # else: response_value is None
+                return None
 
             if response_bytes is not None:
                 logger.debug(
-                    f"RawHandler sending {len(response_bytes)} bytes response."
+                    "RawHandler sending {} bytes response.", len(response_bytes)
                 )
                 return response_bytes
             else:
                 # This handles the case where response_value was None or encoding failed
                 logger.warning(
-                    f"RawHandler: Matched rule resulted in no valid response bytes for request {decoded_data_str!r} (response value was: {match.response!r})"
+                    f"RawHandler: Matched rule resulted in no valid response bytes for request {request!r} (response value was: {match.response!r})"
                 )
                 return None
         else:
-            logger.debug(
-                f"RawHandler: No matching rule found for: {decoded_data_str!r}"
-            )
+            logger.debug("RawHandler: No matching rule found for: {!r}", request)
             return None
@@ -5,6 +5,7 @@ from loguru import logger  # Import loguru
 
 from .base import ProtocolHandler
 from ..core.rules import RuleEngine, RuleMatch  # Import RuleMatch
+from ..utils.config import config_bytes
 
 
 class ScpiProtocolHandler(ProtocolHandler):
@@ -16,9 +17,13 @@ class ScpiProtocolHandler(ProtocolHandler):
     def __init__(self, config: Dict[str, Any], rule_engine: RuleEngine):
         super().__init__(config, rule_engine)
         # Use config directly for terminator and encoding
-        self.terminator = self.config.get("terminator", "\n").encode("ascii")
         self.encoding = self.config.get("encoding", "ascii")
+        self.terminator = config_bytes(
+            self.config.get("terminator", "\n"), self.encoding
+        )
         self._buffer = bytearray()  # Buffer for partial commands
+        # Encode all responses up front instead of on their first match
+        self.rule_engine.encode_responses(self.encoding)
         logger.info(
             f"SCPIHandler initialized with terminator {self.terminator!r} and encoding {self.encoding}"
         )
@@ -28,60 +33,74 @@ class ScpiProtocolHandler(ProtocolHandler):
         Handles SCPI data, buffering until a terminator is found, finds responses,
         applies delays, and returns combined response bytes.
         """
-        self._buffer.extend(received_data)
+        buffer = self._buffer
         logger.trace(
-            f"SCPIHandler received {len(received_data)} bytes, buffer size: {len(self._buffer)}"
+            "SCPIHandler received {} bytes, buffer size: {}",
+            len(received_data),
+            len(buffer) + len(received_data),
         )
 
+        # Loop invariants, looked up once per chunk rather than per command
+        terminator = self.terminator
+        term_len = len(terminator)
+        find_response = self.rule_engine.find_response
+        encoding = self.encoding
+
+        # Split off every complete command with one C-level scan instead of a
+        # find-and-slice round per command; the unterminated tail stays buffered
+        if buffer:
+            buffer.extend(received_data)
+            end = buffer.rfind(terminator)
+            if end == -1:
+                logger.trace("SCPIHandler: No complete command in buffer yet.")
+                return None
+            # Copy the commands out once, straight from the buffer's memory
+            with memoryview(buffer) as view, view[:end] as pending:
+                commands = pending.tobytes().split(terminator)
+            del buffer[: end + term_len]  # Consume commands
+        else:
+            # Usual case, nothing pending: split the chunk itself and only
+            # buffer an unterminated tail
+            end = received_data.rfind(terminator)
+            if end == -1:
+                buffer.extend(received_data)
+                logger.trace("SCPIHandler: No complete command in buffer yet.")
+                return None
+            commands = received_data[:end].split(terminator)
+            buffer.extend(received_data[end + term_len :])
+
         response_parts: List[bytes] = []  # Store byte responses
-        while True:
+        for command in commands:
             try:
-                term_index = self._buffer.find(self.terminator)
-                if term_index == -1:
-                    logger.trace("SCPIHandler: No complete command in buffer yet.")
-                    break  # No complete command in buffer yet
+                # Strip trailing whitespace once, so rules never have to
+                command_bytes = command.rstrip()
 
-                # Extract the command bytes (including terminator)
-                command_bytes = bytes(self._buffer[: term_index + len(self.terminator)])
-                self._buffer = self._buffer[
-                    term_index + len(self.terminator) :
-                ]  # Consume command
-
-                logger.debug(f"SCPIHandler processing command: {command_bytes!r}")
+                logger.debug("SCPIHandler processing command: {!r}", command_bytes)
 
                 # Use rule engine to find response for the complete command
-                match: Optional[RuleMatch] = self.rule_engine.find_response(
-                    command_bytes
-                )
+                match: Optional[RuleMatch] = find_response(command_bytes)
 
                 if match:
                     logger.debug(
-                        f"SCPIHandler found match: response={match.response!r}, delay={match.delay}s"
+                        "SCPIHandler found match: response={!r}, delay={}s",
+                        match.response,
+                        match.delay,
                     )
 
                     # Apply delay if specified
                     if match.delay > 0:
-                        logger.debug(f"SCPIHandler applying delay: {match.delay}s")
+                        logger.debug("SCPIHandler applying delay: {}s", match.delay)
                         await asyncio.sleep(match.delay)
 
-                    # Encode response if needed
-                    response_value = match.response
-                    response_bytes: Optional[bytes] = None
-                    if isinstance(response_value, str):
-                        response_bytes = response_value.encode(self.encoding)
-                    elif isinstance(response_value, bytes):
-                        response_bytes = response_value
-                    elif response_value is not None:
-                        try:
-                            response_bytes = str(response_value).encode(self.encoding)
-                        except Exception as e:
-                            logger.error(
-                                f"SCPIHandler: Failed to encode response {response_value!r}: {e}"
-                            )
-                            # Optionally add an error marker to response_parts?
-                            # For now, skip adding this response part.
-                            continue  # Move to next command in buffer
-                    # else: response_value is None, don't append anything
+                    # Encoded bytes are cached on the match after the first hit
+                    try:
+                        response_bytes = match.as_bytes(encoding)
+                    except Exception as e:
+                        logger.error(
+                            f"SCPIHandler: Failed to encode response {match.response!r}: {e}"
+                        )
+                        # Skip adding this response part.
+                        continue  # Move to next command in buffer
 
                     if response_bytes is not None:
                         response_parts.append(response_bytes)
@@ -92,7 +111,7 @@ class ScpiProtocolHandler(ProtocolHandler):
 
                 else:
                     logger.debug(
-                        f"SCPIHandler: No matching rule for command: {command_bytes!r}"
+                        "SCPIHandler: No matching rule for command: {!r}", command_bytes
                     )
                     # Optionally send an error response based on SCPI standards?
                     # response_parts.append(b"-100,\"Command error\"\n") # Example error
@@ -114,7 +133,7 @@ class ScpiProtocolHandler(ProtocolHandler):
             # Joining with empty bytes assumes responses already include terminators.
             full_response = b"".join(response_parts)
             logger.debug(
-                f"SCPIHandler sending combined response ({len(full_response)} bytes)"
+                "SCPIHandler sending combined response ({} bytes)", len(full_response)
             )
             return full_response
         else:
@@ -1,23 +1,66 @@
+import logging
+import threading
 from typing import Dict, Any
 import yaml  # Import later when implementing
 
+logger = logging.getLogger(__name__)
+
+# libyaml's C loader is several times faster than the pure-Python SafeLoader
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Reported on the first load rather than at import; loads run in worker
+# threads, so the flag is checked and set under a lock
+_slow_loader_warned = False
+_slow_loader_lock = threading.Lock()
+
+
+def _warn_slow_loader() -> None:
+    """Warns, once per process, that configs are parsed without libyaml."""
+    global _slow_loader_warned
+    with _slow_loader_lock:
+        if _slow_loader_warned:
+            return
+        _slow_loader_warned = True
+    logger.warning("libyaml not available, YAML configs will load slowly")
+
+
+def config_bytes(value: Any, encoding: str = "utf-8") -> bytes:
+    """
+    Converts a str or bytes configuration value (e.g. a terminator) to bytes.
+
+    Meant to be called once when a component is built, so that nothing is
+    re-encoded per message. Bytes values (such as YAML `!!binary`) pass through.
+
+    Args:
+        value: The configured value.
+        encoding: Encoding used for str values.
+
+    Returns:
+        The value as bytes.
+
+    Raises:
+        TypeError: If the value is neither str nor bytes.
+    """
+    if isinstance(value, str):
+        return value.encode(encoding)
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    raise TypeError(f"Expected str or bytes, got {type(value).__name__}")
+
 
 def load_config_from_yaml(file_path: str) -> Dict[str, Any]:
     """Loads configuration from a YAML file."""
-    print(f"Loading YAML config from: {file_path}")
-    with open(file_path, "r") as f:
+    if _SafeLoader is yaml.SafeLoader:
+        _warn_slow_loader()
+    logger.debug("Loading YAML config from: %s", file_path)
+    with open(file_path, "rb") as f:
         try:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_SafeLoader)
             # Add validation here later (e.g., using Pydantic or jsonschema)
             return config if config else {}
         except yaml.YAMLError as e:
-            print(
-                f"Error parsing YAML file {file_path}: {e}"
-            )  # Replace with logging/exception
+            logger.error("Error parsing YAML file %s: %s", file_path, e)
             raise  # Re-raise after logging
         except FileNotFoundError:
-            print(
-                f"Configuration file not found: {file_path}"
-            )  # Replace with logging/exception
+            logger.error("Configuration file not found: %s", file_path)
             raise
     # return {"devices": [], "logging": {"level": "INFO"}}  # Placeholder
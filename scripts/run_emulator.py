@@ -7,6 +7,11 @@ from loguru import logger
 
 from emuninja.core.emulator import EmulatorManager
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Optional: libuv-based event loop (Linux/macOS only)
+
 # Configure loguru with enhanced formatting and colors
 logger.remove()  # Remove default handler
 logger.add(
@@ -78,6 +83,9 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received, exiting...")
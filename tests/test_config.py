@@ -0,0 +1,35 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from emuninja.utils import config
+from emuninja.utils.config import load_config_from_yaml
+
+DEVICE_CONFIG = (
+    Path(__file__).resolve().parent.parent / "devices" / "raw_tcp_server.yaml"
+)
+
+
+class SlowLoaderWarningTest(unittest.TestCase):
+    @mock.patch.object(config, "_slow_loader_warned", False)
+    @mock.patch.object(config, "_SafeLoader", yaml.SafeLoader)
+    def test_warns_once_across_concurrent_loads(self) -> None:
+        start = threading.Barrier(8)
+
+        def load(_: int) -> None:
+            start.wait()
+            load_config_from_yaml(str(DEVICE_CONFIG))
+
+        with self.assertLogs(config.logger, "WARNING") as logs:
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(load, range(8)))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("libyaml not available", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from emuninja.core.emulator import EmulatorManager
+
+DEVICE_CONFIG = """\
+name: Register Device
+interface:
+  type: serial
+  port: /dev/null-emuninja
+protocol:
+  type: raw
+  registers:
+    holding:
+      0: 7
+"""
+
+
+class ConfigCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        devices_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(devices_dir.cleanup)
+        Path(devices_dir.name, "device.yaml").write_text(DEVICE_CONFIG)
+        self.manager = EmulatorManager(devices_dir.name)
+
+    def rule_engine(self):
+        return self.manager.devices["Register Device"].protocol.rule_engine
+
+    async def test_restart_resets_written_registers(self) -> None:
+        await self.manager.start_all()
+        self.assertTrue(self.rule_engine().write_register("holding", 0, 42))
+        await self.manager.stop_all()
+
+        await self.manager.start_all()
+        try:
+            self.assertEqual(self.rule_engine().read_registers("holding", 0, 1), [7])
+        finally:
+            await self.manager.stop_all()
+
+
+class CreateProtocolTest(unittest.TestCase):
+    def test_scpi_rejects_interface_terminator(self) -> None:
+        manager = EmulatorManager("devices")
+        with self.assertRaisesRegex(ValueError, "interface 'terminator'"):
+            manager._create_protocol(
+                {"type": "scpi", "terminator": "\n"},
+                {"type": "tcp", "host": "127.0.0.1", "port": 5025, "terminator": "\n"},
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
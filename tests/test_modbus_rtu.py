@@ -0,0 +1,76 @@
+import unittest
+from typing import List
+from unittest import mock
+
+from emuninja.core.rules import RuleEngine
+from emuninja.protocols import modbus_rtu_handler
+from emuninja.protocols.modbus_rtu_handler import ModbusRtuProtocolHandler, crc16_modbus
+
+# Read one holding register at address 0 from unit 1, with its CRC (84 0A)
+READ_REGISTER_FRAME = bytes.fromhex("010300000001840A")
+
+
+class Crc16ModbusTest(unittest.TestCase):
+    def test_known_vector(self) -> None:
+        self.assertEqual(crc16_modbus(bytes.fromhex("010300000001")), 0x0A84)
+
+    def test_wire_order_is_low_byte_first(self) -> None:
+        crc = crc16_modbus(READ_REGISTER_FRAME[:-2])
+        self.assertEqual(crc.to_bytes(2, "little"), READ_REGISTER_FRAME[-2:])
+
+    def test_empty_data(self) -> None:
+        self.assertEqual(crc16_modbus(b""), 0xFFFF)
+
+
+class ModbusRtuFrameTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.handler = ModbusRtuProtocolHandler({"unit_id": 1}, RuleEngine([]))
+
+    async def test_valid_frame_passes_crc_check(self) -> None:
+        with self.assertNoLogs(modbus_rtu_handler.logger, "WARNING"):
+            await self.handler.handle_data(READ_REGISTER_FRAME)
+
+    async def test_corrupted_frame_is_rejected(self) -> None:
+        corrupted = bytearray(READ_REGISTER_FRAME)
+        corrupted[3] ^= 0x01
+        with self.assertLogs(modbus_rtu_handler.logger, "WARNING") as logs:
+            self.assertIsNone(await self.handler.handle_data(bytes(corrupted)))
+        self.assertIn("CRC mismatch", logs.output[0])
+
+
+class ModbusRtuUnitIdTest(unittest.IsolatedAsyncioTestCase):
+    """Frames for other units are dropped before their CRC is computed."""
+
+    def setUp(self) -> None:
+        self.handler = ModbusRtuProtocolHandler({"unit_id": 1}, RuleEngine([]))
+
+    async def checked_units(self, frames: List[bytes]) -> List[int]:
+        checked: List[int] = []
+
+        def crc(data: bytes) -> int:
+            checked.append(data[0])
+            return crc16_modbus(data)
+
+        with mock.patch.object(modbus_rtu_handler, "crc16_modbus", crc):
+            for frame in frames:
+                self.assertIsNone(await self.handler.handle_data(frame))
+        return checked
+
+    async def test_matching_unit_is_checked(self) -> None:
+        self.assertEqual(await self.checked_units([frame_for(1)]), [1])
+
+    async def test_foreign_unit_is_dropped(self) -> None:
+        self.assertEqual(await self.checked_units([frame_for(2), frame_for(247)]), [])
+
+    async def test_broadcast_is_checked(self) -> None:
+        self.assertEqual(await self.checked_units([frame_for(0)]), [0])
+
+
+def frame_for(unit_id: int) -> bytes:
+    """Builds a valid read-holding-register frame addressed to `unit_id`."""
+    body = bytes([unit_id]) + READ_REGISTER_FRAME[1:-2]
+    return body + crc16_modbus(body).to_bytes(2, "little")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+from emuninja.core import rules
+from emuninja.core.rules import RuleEngine
+from emuninja.protocols.raw_handler import RawProtocolHandler
+
+RULES = (
+    [
+        {"receive": {"type": "exact", "value": value}, "respond": {"value": response}}
+        for value, response in [("MEAS?", "1.5"), ("Über?", "ja")]
+    ]
+    + [
+        {"receive": {"type": "prefix", "value": value}, "respond": {"value": response}}
+        for value, response in [("VOLT", "volt"), ("Éta", "eta")]
+    ]
+    + [
+        {"receive": {"type": "regex", "value": value}, "respond": {"value": response}}
+        for value, response in [
+            (r"CURR\s*\d+$", "curr"),
+            (r"T[éa]mp\w*", "temp"),
+            (r"(?i)syst:err\?", "0"),
+        ]
+    ]
+)
+
+REQUESTS = [
+    "MEAS?",
+    "MEAS? ",
+    "Über?",
+    "VOLT 5",
+    "VOL",
+    "Étape",
+    "Éta 1",
+    "CURR 10",
+    "CURR\t7",
+    "CURR x",
+    "Tamp",
+    "Témpérature",
+    "SYST:ERR?",
+    "syst:err?",
+    "ß",
+    "",
+]
+
+
+def decoded_response(request: bytes, encoding: str) -> Optional[bytes]:
+    """What the handler answered when it always decoded to str."""
+    try:
+        text = request.decode(encoding)
+    except UnicodeDecodeError:
+        return None
+    with mock.patch.object(rules, "hyperscan", None):
+        match = RuleEngine(RULES).find_response(text)
+    return match.as_bytes(encoding) if match else None
+
+
+class RawHandlerRequestTypeTest(unittest.TestCase):
+    """ASCII requests skip the decode without changing which rule matches."""
+
+    def check(self, encoding: str) -> None:
+        handler = RawProtocolHandler(
+            {"encoding": encoding, "terminator": "\n"}, RuleEngine(RULES)
+        )
+        requests: List[bytes] = [text.encode(encoding) for text in REQUESTS] + [
+            text.encode("utf-8") for text in REQUESTS if not text.isascii()
+        ]
+        for request in requests:
+            with self.subTest(request=request):
+                expected = decoded_response(request, encoding)
+                response = asyncio.run(handler.handle_data(request + b"\n"))
+                self.assertEqual(response, expected)
+
+    def test_utf8(self) -> None:
+        self.check("utf-8")
+
+    def test_latin1(self) -> None:
+        self.check("latin-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import re
+import unittest
+from unittest import mock
+
+from emuninja.core import regex_translation
+from emuninja.core.regex_translation import translate_regex
+from tests.test_rules import TRICKY_PATTERNS, TRICKY_REQUESTS
+
+
+def as_python(translated: str) -> "re.Pattern[str]":
+    """Compiles a translation with re, to check it without Hyperscan or RE2."""
+    source = re.sub(
+        r"\\x\{([0-9a-f]+)\}", lambda m: "\\U%08x" % int(m.group(1), 16), translated
+    )
+    return re.compile(source.replace(r"\z", r"\Z"))
+
+
+class TranslateRegexTest(unittest.TestCase):
+    def test_translation_matches_like_the_pattern(self) -> None:
+        for pattern in TRICKY_PATTERNS:
+            for ascii_only in (True, False):
+                translated = translate_regex(pattern, ascii_only)
+                if translated is None:
+                    continue
+                expression = as_python(translated)
+                for request in TRICKY_REQUESTS:
+                    if ascii_only and not request.isascii():
+                        continue
+                    with self.subTest(pattern=pattern, request=request):
+                        self.assertEqual(
+                            expression.match(request) is not None,
+                            re.match(pattern, request) is not None,
+                        )
+
+    def test_python_only_syntax_is_spelled_out(self) -> None:
+        self.assertEqual(translate_regex(r"a{,3}z", True), r"(?:\x{61}){0,3}\x{7a}")
+        self.assertEqual(translate_regex(r"END$", True), r"\x{45}\x{4e}\x{44}(?:\n?\z)")
+
+    def test_untranslatable_patterns(self) -> None:
+        for pattern in [r"(?=A)A", r"(a)\1", r"(?>a)", r"(?m)^A", r"A$B", r"[", r"\bA"]:
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(translate_regex(pattern, False))
+
+    def test_unexpected_parser_errors_fall_back(self) -> None:
+        translate_regex.cache_clear()
+        self.addCleanup(translate_regex.cache_clear)
+        with mock.patch.object(
+            regex_translation.sre_parse, "parse", side_effect=AttributeError("state")
+        ):
+            with self.assertLogs(regex_translation.logger, "WARNING"):
+                self.assertIsNone(translate_regex(r"VOLT\d", True))
+
+
+if __name__ == "__main__":
+    unittest.main()
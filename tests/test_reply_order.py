@@ -0,0 +1,77 @@
+import asyncio
+import os
+import socket
+import unittest
+
+from emuninja.interfaces.serial_interface import SerialInterface
+from emuninja.interfaces.tcp_interface import TcpServerInterface
+
+# The first request is answered slowly, so the second reply is ready first
+DELAYS = {b"SLOW": 0.3, b"FAST": 0.0}
+
+
+async def delayed_echo(message: bytes) -> bytes:
+    request = bytes(message).strip()
+    await asyncio.sleep(DELAYS[request])
+    return request
+
+
+async def read_until(fd: int, end: bytes) -> bytes:
+    """Reads from a non-blocking file descriptor until `end` arrives."""
+    received = b""
+    while not received.endswith(end):
+        try:
+            received += os.read(fd, 1024)
+        except BlockingIOError:
+            await asyncio.sleep(0.01)
+    return received
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TcpReplyOrderTest(unittest.IsolatedAsyncioTestCase):
+    async def test_pipelined_replies_keep_request_order(self) -> None:
+        port = free_port()
+        interface = TcpServerInterface(
+            {"host": "127.0.0.1", "port": port, "terminator": "\r\n"}
+        )
+        await interface.start(delayed_echo)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"SLOW\r\nFAST\r\n")
+            await writer.drain()
+            replies = await asyncio.wait_for(reader.readexactly(8), timeout=2)
+            self.assertEqual(replies, b"SLOWFAST")
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await interface.stop()
+
+
+@unittest.skipUnless(hasattr(os, "openpty"), "needs a pseudo-terminal")
+class SerialReplyOrderTest(unittest.IsolatedAsyncioTestCase):
+    async def test_pipelined_replies_keep_request_order(self) -> None:
+        import tty
+
+        master, slave = os.openpty()
+        self.addCleanup(os.close, slave)
+        self.addCleanup(os.close, master)
+        tty.setraw(master)
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        interface = SerialInterface({"type": "serial", "port": os.ttyname(slave)})
+        await interface.start(delayed_echo)
+        try:
+            os.write(master, b"SLOW\r\nFAST\r\n")
+            received = await asyncio.wait_for(read_until(master, b"FAST\r\n"), 2)
+            self.assertEqual(received, b"SLOW\r\nFAST\r\n")
+        finally:
+            await interface.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+import yaml
+
+from emuninja.core import rules
+from emuninja.core.rules import RuleEngine
+
+DEVICES_DIR = Path(__file__).resolve().parent.parent / "devices"
+
+# Patterns whose syntax other engines accept but read differently from re
+TRICKY_PATTERNS = [
+    r"a{,3}z",
+    r"VOLT\s*\d+$",
+    r"MEAS(?::VOLT)?\?\Z",
+    r"(?i)conf:(curr|volt)",
+    r"\w+=\d{1,3}",
+    r"[[:alpha:]]+",
+    r"SET\v1",
+    r"\bRST\b",
+    r"x{2,}y|z$",
+    r"(?m)LINE$",
+    r"(?s)A.B",
+    r"(?x) S Y S T : [0-9]+ # verbose",
+    r"(?=LOOK)LOOKAHEAD",
+]
+
+TRICKY_REQUESTS = [
+    "z",
+    "az",
+    "aaaz",
+    "aaaaz",
+    "a{,3}z",
+    "VOLT 12",
+    "VOLT 12\n",
+    "VOLT 12\n\n",
+    "VOLT\x1c12",
+    "VOLT٣",
+    "MEAS?",
+    "MEAS:VOLT?\n",
+    "CONF:CURR",
+    "conf:volt",
+    "coſ",
+    "KK=7",
+    "été=123",
+    "abc",
+    ":a:",
+    "SET\x0b1",
+    "SETv1",
+    "RST",
+    "RST!",
+    "RSTX",
+    "xxy",
+    "xy",
+    "z\n",
+    "LINE\nmore",
+    "LINE\n",
+    "A\nB",
+    "SYST:42",
+    "LOOKAHEAD",
+    "",
+]
+
+
+def load_fixture_rules() -> List[Dict[str, Any]]:
+    """Returns the rules of every device configuration shipped in devices/."""
+    fixture_rules: List[Dict[str, Any]] = []
+    for path in sorted(DEVICES_DIR.glob("*.yaml")):
+        with open(path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        fixture_rules.extend((config.get("protocol") or {}).get("rules") or [])
+    return fixture_rules
+
+
+def make_rules(match_type: str, values: List[Any]) -> List[Dict[str, Any]]:
+    """Builds one rule per value, answering 'rule <position>'."""
+    return [
+        {
+            "receive": {"type": match_type, "value": value},
+            "respond": {"type": "exact", "value": f"rule {number}"},
+        }
+        for number, value in enumerate(values)
+    ]
+
+
+def regex_rules(patterns: List[str]) -> List[Dict[str, Any]]:
+    return make_rules("regex", patterns)
+
+
+def requests_for(fixture_rules: List[Dict[str, Any]]) -> List[Any]:
+    """Builds str and bytes requests around the rules' own values."""
+    texts = list(TRICKY_REQUESTS)
+    for rule in fixture_rules:
+        value = str((rule.get("receive") or {}).get("value"))
+        texts += [value, value + " 10", value + "\n", value[:-1], value.lower()]
+    requests: List[Any] = []
+    for text in texts:
+        requests.append(text)
+        requests.append(text.encode("utf-8"))
+    return requests
+
+
+def responses(engine: RuleEngine, requests: List[Any]) -> List[Any]:
+    return [
+        (request, match.response if match else None)
+        for request, match in ((r, engine.find_response(r)) for r in requests)
+    ]
+
+
+class RegexEngineEquivalenceTest(unittest.TestCase):
+    """The optional regex engines must not change which rule matches."""
+
+    def setUp(self) -> None:
+        self.rules = load_fixture_rules() + regex_rules(TRICKY_PATTERNS)
+        self.requests = requests_for(self.rules)
+        with mock.patch.object(rules, "hyperscan", None):
+            self.expected = responses(RuleEngine(self.rules), self.requests)
+
+    @unittest.skipIf(rules.hyperscan is None, "hyperscan is not installed")
+    def test_hyperscan_matches_like_re(self) -> None:
+        engine = RuleEngine(self.rules)
+        self.assertTrue(engine._hyperscan_ids)
+        self.assertEqual(responses(engine, self.requests), self.expected)
+
+    @unittest.skipIf(rules.hyperscan is None, "hyperscan is not installed")
+    def test_hyperscan_keeps_python_quantifiers(self) -> None:
+        engine = RuleEngine(regex_rules([r"a{,3}z"]))
+        self.assertEqual(engine._hyperscan_ids, [0])
+        self.assertIsNotNone(engine.find_response("aaz"))
+        self.assertIsNone(engine.find_response("a{,3}z"))
+
+    @unittest.skipIf(rules.re2 is None, "google-re2 is not installed")
+    def test_re2_matches_like_re(self) -> None:
+        engine = RuleEngine(self.rules, regex_engine="re2")
+        self.assertIsNotNone(engine._combined_regex)
+        self.assertEqual(responses(engine, self.requests), self.expected)
+
+    @unittest.skipIf(rules.re2 is None, "google-re2 is not installed")
+    def test_re2_keeps_python_semantics(self) -> None:
+        engine = RuleEngine(
+            regex_rules([r"a{,3}z", r"END$", r"\w+\d"]), regex_engine="re2"
+        )
+        self.assertEqual(engine._regex_indices, [])
+        self.assertIsNotNone(engine.find_response("aaz"))
+        self.assertIsNotNone(engine.find_response("END\n"))
+        self.assertIsNotNone(engine.find_response("été٣"))
+
+
+@mock.patch.object(rules, "hyperscan", None)
+class CombinedRegexTest(unittest.TestCase):
+    """Regex rules share one alternation unless a rule cannot be embedded."""
+
+    def test_global_flags_are_scoped_to_their_rule(self) -> None:
+        engine = RuleEngine(
+            regex_rules([r"VOLT \d+", r"(?i)curr\?", r"(?x) M E A S \? # query"])
+        )
+        self.assertIsNotNone(engine._combined_regex)
+        self.assertEqual(engine._regex_indices, [])
+        self.assertEqual(engine.find_response("VOLT 5").response, "rule 0")
+        self.assertEqual(engine.find_response("CURR?").response, "rule 1")
+        self.assertEqual(engine.find_response("MEAS?").response, "rule 2")
+        self.assertIsNone(engine.find_response("volt 5"))
+
+    def test_reused_group_name_matches_individually(self) -> None:
+        engine = RuleEngine(regex_rules([r"CH(?P<ch>\d)", r"OUT(?P<ch>\d)", r"RST"]))
+        self.assertIsNotNone(engine._combined_regex)
+        self.assertEqual(engine._regex_indices, [1])
+        self.assertEqual(engine.find_response("CH1").response, "rule 0")
+        self.assertEqual(engine.find_response("OUT2").response, "rule 1")
+        self.assertEqual(engine.find_response("RST").response, "rule 2")
+
+
+class RegexFlagsTest(unittest.TestCase):
+    """Rule 'flags' are applied to the pattern, next to its inline flags."""
+
+    def flagged_rule(self, pattern: str, flags: Any) -> RuleEngine:
+        rule = regex_rules([pattern])[0]
+        rule["receive"]["flags"] = flags
+        return RuleEngine([rule])
+
+    def test_flag_alone(self) -> None:
+        engine = self.flagged_rule(r"volt\?", ["ignorecase"])
+        self.assertIsNotNone(engine.find_response("VOLT?"))
+        self.assertIsNotNone(engine.find_response("volt?"))
+
+    def test_flag_with_inline_flag(self) -> None:
+        engine = self.flagged_rule(r"(?s)volt.\?", "IGNORECASE")
+        self.assertIsNotNone(engine.find_response("VOLT\n?"))
+        self.assertIsNone(engine.find_response("VOLT?"))
+
+    def test_unknown_flag_disables_rule(self) -> None:
+        with self.assertLogs(rules.logger, "WARNING") as logs:
+            engine = self.flagged_rule(r"VOLT\?", ["UNICODE_PLEASE"])
+        self.assertIn("unsupported regex flag", logs.output[0])
+        self.assertIsNone(engine.find_response("VOLT?"))
+
+
+class PrefixRuleTest(unittest.TestCase):
+    def response(self, engine: RuleEngine, request: Any) -> Optional[str]:
+        match = engine.find_response(request)
+        return match.response if match else None
+
+    def test_overlapping_prefixes_first_declared_wins(self) -> None:
+        engine = RuleEngine(make_rules("prefix", ["MEAS:VOLT", "MEAS", "MEAS:"]))
+        self.assertEqual(self.response(engine, "MEAS:VOLT?"), "rule 0")
+        self.assertEqual(self.response(engine, "MEAS:CURR?"), "rule 1")
+        self.assertEqual(self.response(engine, "MEAS"), "rule 1")
+        self.assertIsNone(self.response(engine, "MEA"))
+
+    def test_overlapping_prefixes_priority_wins(self) -> None:
+        config = make_rules("prefix", ["MEAS", "MEAS:VOLT"])
+        config[1]["priority"] = 1
+        engine = RuleEngine(config)
+        self.assertEqual(self.response(engine, "MEAS:VOLT?"), "rule 1")
+        self.assertEqual(self.response(engine, "MEAS:CURR?"), "rule 0")
+
+    def test_prefix_and_exact_rules_keep_declaration_order(self) -> None:
+        config = make_rules("prefix", ["*IDN", "*RST", "*"])
+        config[1]["receive"]["type"] = "exact"
+        engine = RuleEngine(config)
+        self.assertEqual(self.response(engine, "*IDN?"), "rule 0")
+        self.assertEqual(self.response(engine, "*RST"), "rule 1")
+        self.assertEqual(self.response(engine, "*RST?"), "rule 2")
+        self.assertEqual(self.response(engine, "*CLS"), "rule 2")
+
+    def test_empty_prefix_matches_everything_after_earlier_rules(self) -> None:
+        engine = RuleEngine(make_rules("prefix", ["SYST", "", "VOLT"]))
+        self.assertEqual(self.response(engine, "SYST:ERR?"), "rule 0")
+        self.assertEqual(self.response(engine, "VOLT 5"), "rule 1")
+        self.assertEqual(self.response(engine, ""), "rule 1")
+        self.assertEqual(self.response(engine, b"\xff"), "rule 1")
+
+    def test_str_and_bytes_prefixes_match_both_request_types(self) -> None:
+        engine = RuleEngine(make_rules("prefix", ["MEAS", b"SYST", b"\xffRAW"]))
+        for request in ("MEAS?", b"MEAS?"):
+            self.assertEqual(self.response(engine, request), "rule 0")
+        for request in ("SYST:ERR?", b"SYST:ERR?"):
+            self.assertEqual(self.response(engine, request), "rule 1")
+        # Not UTF-8, so it has no str form
+        self.assertEqual(self.response(engine, b"\xffRAW 1"), "rule 2")
+        self.assertIsNone(self.response(engine, "\xffRAW 1"))
+
+
+class RulePriorityTest(unittest.TestCase):
+    """Higher priorities win; equal priorities keep declaration order."""
+
+    def engine(self, priorities: List[Optional[int]]) -> RuleEngine:
+        # Every rule matches 'VOLT 5', each through a different lookup
+        config = make_rules("prefix", ["VOLT", "VOLT 5", r"VOLT \d", "VOLT "])
+        config[1]["receive"]["type"] = "exact"
+        config[2]["receive"]["type"] = "regex"
+        for rule, priority in zip(config, priorities):
+            if priority is not None:
+                rule["priority"] = priority
+        return RuleEngine(config)
+
+    def winner(self, priorities: List[Optional[int]]) -> str:
+        return self.engine(priorities).find_response("VOLT 5").response
+
+    def test_declaration_order_by_default(self) -> None:
+        self.assertEqual(self.winner([None, None, None, None]), "rule 0")
+
+    def test_higher_priority_wins(self) -> None:
+        self.assertEqual(self.winner([0, 0, 5, 1]), "rule 2")
+        self.assertEqual(self.winner([-1, None, None, None]), "rule 1")
+
+    def test_equal_priorities_keep_declaration_order(self) -> None:
+        self.assertEqual(self.winner([0, 3, 3, 3]), "rule 1")
+        self.assertEqual(self.winner([0, 0, 3, 3]), "rule 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+from loguru import logger
+
+from emuninja.interfaces import serial_interface
+from emuninja.interfaces.serial_interface import SerialInterface
+
+
+class SerialFramingTest(unittest.IsolatedAsyncioTestCase):
+    """Framing of the chunks the reader thread hands to the event loop."""
+
+    async def asyncSetUp(self) -> None:
+        self.messages: List[bytes] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.interface = SerialInterface({"type": "serial", "port": "unused"})
+        self.interface._data_handler = self.record
+
+    async def record(self, message: bytes) -> Optional[bytes]:
+        self.messages.append(message)
+        await self.release.wait()
+        return None
+
+    def capture_warnings(self) -> List[str]:
+        """Collects the warnings logged (through loguru) during the test."""
+        warnings: List[str] = []
+        sink = logger.add(warnings.append, level="WARNING", format="{message}")
+        self.addCleanup(logger.remove, sink)
+        return warnings
+
+    async def receive(self, *chunks: bytes) -> List[bytes]:
+        for chunk in chunks:
+            self.interface._data_received(chunk)
+            self.assertLessEqual(
+                len(self.interface._buffer), serial_interface.DEFAULT_MAX_BUFFER_SIZE
+            )
+        await asyncio.sleep(0)
+        return self.messages
+
+    async def test_split_terminator(self) -> None:
+        self.assertEqual(
+            await self.receive(b"PING\r", b"\nPONG\r\n"), [b"PING", b"PONG"]
+        )
+
+    async def test_unterminated_flood_is_discarded_up_to_the_terminator(
+        self,
+    ) -> None:
+        flood = [b"X" * 4096] * 20  # 80 KiB, over the 64 KiB default bound
+        warnings = self.capture_warnings()
+        messages = await self.receive(*flood, b"XX\r\nPING\r\n")
+        self.assertIn("Discarding", warnings[0])
+        # The rest of the oversized message is dropped; framing then recovers
+        self.assertEqual(messages, [b"PING"])
+        self.assertEqual(self.interface._buffer, b"")
+
+    @mock.patch.object(serial_interface, "MAX_PENDING_REPLIES", 4)
+    async def test_messages_over_pending_reply_bound_are_dropped(self) -> None:
+        self.release.clear()
+        requests = b"".join(b"REQ%d\r\n" % number for number in range(6))
+        warnings = self.capture_warnings()
+        messages = await self.receive(requests)
+        self.assertEqual(messages, [b"REQ0", b"REQ1", b"REQ2", b"REQ3"])
+        self.assertEqual(len(warnings), 2)
+        # Once replies complete, new messages are accepted again
+        self.release.set()
+        await asyncio.gather(*self.interface._reply_tasks)
+        self.assertEqual((await self.receive(b"REQ6\r\n"))[-1], b"REQ6")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import socket
+import unittest
+from typing import Any, List, Optional, Tuple
+
+from emuninja.interfaces.tcp_interface import TcpServerInterface
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TcpFramingTest(unittest.IsolatedAsyncioTestCase):
+    """Requests are framed on the interface 'terminator'."""
+
+    async def asyncSetUp(self) -> None:
+        self.port = free_port()
+        self.messages: List[bytes] = []
+        self.interface = TcpServerInterface(
+            {
+                "host": "127.0.0.1",
+                "port": self.port,
+                "terminator": "\r\n",
+                "read_size": 16,
+            }
+        )
+        await self.interface.start(self.record)
+        self.addAsyncCleanup(self.interface.stop)
+
+    async def record(self, message: bytes) -> Optional[bytes]:
+        self.messages.append(bytes(message))
+        return None
+
+    async def send(self, *chunks: bytes) -> List[bytes]:
+        """Sends the chunks one by one, closes, and returns the messages."""
+        _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+            await asyncio.sleep(0.05)
+        writer.close()
+        await writer.wait_closed()
+        await asyncio.sleep(0.1)
+        return self.messages
+
+    async def test_split_terminator(self) -> None:
+        self.assertEqual(await self.send(b"PING\r", b"\nPONG\r\n"), [b"PING", b"PONG"])
+
+    async def test_empty_messages_are_skipped(self) -> None:
+        self.assertEqual(await self.send(b"\r\nPING\r\n\r\n"), [b"PING"])
+
+    async def test_partial_message_at_eof(self) -> None:
+        self.assertEqual(await self.send(b"PING\r\nPART"), [b"PING", b"PART"])
+
+    async def test_oversized_message_is_discarded(self) -> None:
+        with self.assertLogs("emuninja.interfaces.tcp_interface", "WARNING"):
+            messages = await self.send(b"X" * 40 + b"\r\nPING\r\n")
+        self.assertEqual(messages, [b"PING"])
+
+    async def test_oversized_message_split_across_reads_is_discarded(self) -> None:
+        with self.assertLogs("emuninja.interfaces.tcp_interface", "WARNING"):
+            messages = await self.send(b"X" * 40, b"XX\r\nPING\r\n")
+        self.assertEqual(messages, [b"PING"])
+
+    async def test_oversized_message_at_eof_is_discarded(self) -> None:
+        with self.assertLogs("emuninja.interfaces.tcp_interface", "WARNING"):
+            messages = await self.send(b"PING\r\n" + b"X" * 40)
+        self.assertEqual(messages, [b"PING"])
+
+
+class TcpConnectionLimitTest(unittest.IsolatedAsyncioTestCase):
+    """Clients beyond 'max_connections' are refused until a slot frees up."""
+
+    async def asyncSetUp(self) -> None:
+        self.port = free_port()
+        self.interface = TcpServerInterface(
+            {"host": "127.0.0.1", "port": self.port, "max_connections": 2}
+        )
+        await self.interface.start(self.echo)
+        self.addAsyncCleanup(self.interface.stop)
+
+    async def echo(self, message: bytes) -> bytes:
+        return bytes(message)
+
+    async def connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.addAsyncCleanup(close, writer)
+        return reader, writer
+
+    async def is_served(self, reader: asyncio.StreamReader, writer: Any) -> bool:
+        """Returns whether the server echoes a request, False if it closed."""
+        try:
+            writer.write(b"PING")
+            await writer.drain()
+            reply = await asyncio.wait_for(reader.read(4), timeout=2)
+        except ConnectionError:
+            return False
+        return reply == b"PING"
+
+    async def test_connection_over_limit_is_refused_and_closed(self) -> None:
+        clients = [await self.connect() for _ in range(2)]
+        for client in clients:
+            self.assertTrue(await self.is_served(*client))
+        with self.assertLogs("emuninja.interfaces.tcp_interface", "WARNING"):
+            reader, writer = await self.connect()
+            self.assertEqual(await asyncio.wait_for(reader.read(), timeout=2), b"")
+        self.assertFalse(await self.is_served(reader, writer))
+
+    async def test_disconnect_frees_a_slot(self) -> None:
+        clients = [await self.connect() for _ in range(2)]
+        for client in clients:
+            self.assertTrue(await self.is_served(*client))
+        await close(clients[0][1])
+        # Wait for the server to notice the disconnect
+        for _ in range(100):
+            if len(self.interface._client_handler_tasks) < 2:
+                break
+            await asyncio.sleep(0.01)
+        self.assertTrue(await self.is_served(*await self.connect()))
+
+
+async def close(writer: asyncio.StreamWriter) -> None:
+    if not writer.is_closing():
+        writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()